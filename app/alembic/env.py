@@ -5,12 +5,14 @@ from sqlalchemy import pool
 
 from alembic import context
 
-from models.article import Base
-from database import SQLALCHEMY_DATABASE_URL
+from database import Base, database_url
+import models  # noqa: F401  註冊所有資料表
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
+# 與應用程式使用相同的 DATABASE_URL
+config.set_main_option("sqlalchemy.url", database_url().replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -0,0 +1,48 @@
+"""add indexes for article and tag query patterns
+
+Revision ID: 5d2b8f4c1e93
+Revises: c41e7d9a2f10
+Create Date: 2026-10-19 10:05:47.902316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8f4c1e93'
+down_revision: Union[str, None] = 'c41e7d9a2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY 不能在交易中執行，建立索引時不鎖住寫入
+    with op.get_context().autocommit_block():
+        op.create_index('ix_articles_source_created_at', 'articles', ['source', 'created_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_articles_created_at', 'articles', ['created_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_articles_updated_at', 'articles', ['updated_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_articles_category', 'articles', ['category'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tags_name_lower', 'tags', [sa.text('lower(name)')],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_article_tags_tag_id', 'article_tags', ['tag_id', 'article_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+    op.execute('ANALYZE articles')
+    op.execute('ANALYZE tags')
+    op.execute('ANALYZE article_tags')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_article_tags_tag_id', table_name='article_tags', postgresql_concurrently=True)
+        op.drop_index('ix_tags_name_lower', table_name='tags', postgresql_concurrently=True)
+        op.drop_index('ix_articles_category', table_name='articles', postgresql_concurrently=True)
+        op.drop_index('ix_articles_updated_at', table_name='articles', postgresql_concurrently=True)
+        op.drop_index('ix_articles_created_at', table_name='articles', postgresql_concurrently=True)
+        op.drop_index('ix_articles_source_created_at', table_name='articles', postgresql_concurrently=True)
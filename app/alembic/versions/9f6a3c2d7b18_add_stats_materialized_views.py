@@ -0,0 +1,51 @@
+"""add materialized views for article and tag statistics
+
+Revision ID: 9f6a3c2d7b18
+Revises: 5d2b8f4c1e93
+Create Date: 2026-10-19 10:41:09.263581
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f6a3c2d7b18'
+down_revision: Union[str, None] = '5d2b8f4c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # source / category 以空字串取代 NULL，讓唯一索引能支援 REFRESH ... CONCURRENTLY
+    op.execute("""
+        CREATE MATERIALIZED VIEW article_category_stats AS
+        SELECT coalesce(source, '') AS source,
+               coalesce(category, '') AS category,
+               count(*) AS article_count,
+               count(*) FILTER (WHERE content IS NOT NULL AND content <> '') AS with_content_count,
+               max(created_at) AS latest_created_at,
+               now()::timestamp AS refreshed_at
+        FROM articles
+        GROUP BY 1, 2
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_article_category_stats ON article_category_stats (source, category)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW tag_stats AS
+        SELECT t.id AS tag_id,
+               t.name,
+               count(at.article_id) AS article_count
+        FROM tags t
+        LEFT JOIN article_tags at ON at.tag_id = t.id
+        GROUP BY t.id, t.name
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_tag_stats_tag_id ON tag_stats (tag_id)")
+    op.execute("CREATE INDEX ix_tag_stats_article_count ON tag_stats (article_count DESC, name)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS tag_stats")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS article_category_stats")
@@ -0,0 +1,32 @@
+"""add article processed_at for text post-processing
+
+Revision ID: a3c7e5f19d24
+Revises: e7a4d1b96c52
+Create Date: 2026-10-19 13:02:14.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e5f19d24'
+down_revision: Union[str, None] = 'e7a4d1b96c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 既有文章的 processed_at 為 NULL，之後由 python postprocess.py 批次整理
+    op.add_column('articles', sa.Column('processed_at', sa.DateTime(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_articles_unprocessed', 'articles', ['id'],
+                        postgresql_where=sa.text('processed_at IS NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_unprocessed', table_name='articles')
+    op.drop_column('articles', 'processed_at')
@@ -0,0 +1,36 @@
+"""add tag_aliases for canonical tag mapping
+
+Revision ID: b8d2f6a4c913
+Revises: a3c7e5f19d24
+Create Date: 2026-10-19 13:41:36.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f6a4c913'
+down_revision: Union[str, None] = 'a3c7e5f19d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 既有標籤的別名與重複標籤合併由 python merge_tags.py 處理
+    op.create_table(
+        'tag_aliases',
+        sa.Column('alias', sa.String(length=100), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('alias')
+    )
+    op.create_index('ix_tag_aliases_tag_id', 'tag_aliases', ['tag_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tag_aliases_tag_id', table_name='tag_aliases')
+    op.drop_table('tag_aliases')
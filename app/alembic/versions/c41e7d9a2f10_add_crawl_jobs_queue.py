@@ -0,0 +1,46 @@
+"""add crawl_jobs queue
+
+Revision ID: c41e7d9a2f10
+Revises: 8be5943cea46
+Create Date: 2026-10-19 09:12:33.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7d9a2f10'
+down_revision: Union[str, None] = '8be5943cea46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('crawl_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('worker_id', sa.String(length=100), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('url')
+    )
+    op.create_index('ix_crawl_jobs_pending', 'crawl_jobs', ['available_at', 'id'], unique=False,
+                    postgresql_where=sa.text("status = 'pending'"))
+    op.create_index('ix_crawl_jobs_running_lease', 'crawl_jobs', ['lease_expires_at'], unique=False,
+                    postgresql_where=sa.text("status = 'running'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_crawl_jobs_running_lease', table_name='crawl_jobs')
+    op.drop_index('ix_crawl_jobs_pending', table_name='crawl_jobs')
+    op.drop_table('crawl_jobs')
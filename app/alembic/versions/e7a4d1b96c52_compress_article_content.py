@@ -0,0 +1,74 @@
+"""compress article content and add content hash
+
+Revision ID: e7a4d1b96c52
+Revises: 9f6a3c2d7b18
+Create Date: 2026-10-19 11:17:52.640129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4d1b96c52'
+down_revision: Union[str, None] = '9f6a3c2d7b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def _create_category_stats(content_filter):
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW article_category_stats AS
+        SELECT coalesce(source, '') AS source,
+               coalesce(category, '') AS category,
+               count(*) AS article_count,
+               count(*) FILTER (WHERE {content_filter}) AS with_content_count,
+               max(created_at) AS latest_created_at,
+               now()::timestamp AS refreshed_at
+        FROM articles
+        GROUP BY 1, 2
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_article_category_stats ON article_category_stats (source, category)")
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('articles', sa.Column('content_length', sa.Integer(), nullable=True))
+
+    # PostgreSQL 14+ 的 TOAST 支援 lz4，壓縮與解壓都比預設的 pglz 快
+    # 既有資料會在下次改寫時以 lz4 重新壓縮（或手動 VACUUM FULL articles）
+    op.execute("ALTER TABLE articles ALTER COLUMN content SET COMPRESSION lz4")
+
+    # 分批回填，每批各自 commit，避免單一交易改寫整張表並長時間持有鎖；
+    # autocommit_block 會先 commit 前面新增的欄位。產生 SQL（--sql）時無法查詢資料，改為單一 UPDATE
+    backfill = """
+        UPDATE articles
+        SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex'),
+            content_length = char_length(content)
+        WHERE content IS NOT NULL
+    """
+    if op.get_context().as_sql:
+        op.execute(backfill)
+    else:
+        with op.get_context().autocommit_block():
+            bind = op.get_bind()
+            max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM articles")).scalar()
+            for start in range(0, max_id + 1, BACKFILL_BATCH):
+                bind.execute(sa.text(backfill + " AND id >= :start AND id < :end"),
+                             {'start': start, 'end': start + BACKFILL_BATCH})
+
+    # 統計改用 content_length 判斷有無內文，更新時不必解壓每一篇文章
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS article_category_stats")
+    _create_category_stats('content_length > 0')
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS article_category_stats")
+    _create_category_stats("content IS NOT NULL AND content <> ''")
+    op.execute("ALTER TABLE articles ALTER COLUMN content SET COMPRESSION pglz")
+    op.drop_column('articles', 'content_length')
+    op.drop_column('articles', 'content_hash')
@@ -0,0 +1,43 @@
+"""cascade article_tags on article and tag deletes
+
+Revision ID: f1e9c3b7a2d5
+Revises: b8d2f6a4c913
+Create Date: 2026-10-19 14:20:51.776430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1e9c3b7a2d5'
+down_revision: Union[str, None] = 'b8d2f6a4c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = (
+    ('article_tags_article_id_fkey', 'article_id', 'articles'),
+    ('article_tags_tag_id_fkey', 'tag_id', 'tags'),
+)
+
+
+def _replace_foreign_keys(on_delete):
+    # 每個語句各自 commit：NOT VALID 只需短暫鎖定，之後 VALIDATE 檢查既有資料時不會擋住寫入
+    with op.get_context().autocommit_block():
+        for name, column, table in FOREIGN_KEYS:
+            op.execute(f"""
+                ALTER TABLE article_tags
+                DROP CONSTRAINT IF EXISTS {name},
+                ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {table} (id){on_delete} NOT VALID
+            """)
+            op.execute(f"ALTER TABLE article_tags VALIDATE CONSTRAINT {name}")
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(' ON DELETE CASCADE')
+
+
+def downgrade() -> None:
+    _replace_foreign_keys('')
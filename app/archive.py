@@ -0,0 +1,216 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import uuid
+from datetime import datetime, timezone
+
+# 封存設定
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive')
+ARCHIVE_ENABLED = os.getenv('ARCHIVE_ENABLED', '1') != '0'
+SEGMENT_MAX_BYTES = int(os.getenv('ARCHIVE_SEGMENT_MAX_BYTES', str(256 * 1024 * 1024)))
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = '.warc.gz'
+INDEX_SUFFIX = '.idx.ndjson'
+
+_CHARSET = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+def _decode(body, content_type):
+    """依 Content-Type 記錄的編碼解碼原始內容，沒有或無法辨識時以 UTF-8 解碼"""
+    match = _CHARSET.search(content_type or '')
+    try:
+        return body.decode(match.group(1) if match else 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+class PageArchive:
+    """原始網頁封存
+
+    每筆回應寫成一個獨立的 gzip member（WARC resource 記錄），依序附加到分段檔，
+    並在同名的 .idx.ndjson 索引檔記錄位移與長度，之後可直接 seek 讀回單筆記錄。
+    每個寫入程序使用自己的分段檔，多個容器共用同一個目錄也不會互相覆寫。
+    """
+
+    def __init__(self, root=None, segment_max_bytes=SEGMENT_MAX_BYTES):
+        self.root = root or ARCHIVE_DIR
+        self.segment_max_bytes = segment_max_bytes
+        self.writer_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._lock = threading.Lock()
+        self._segment_no = 0
+        self._segment_path = None
+        self._segment_size = 0
+
+    def _open_segment(self):
+        """建立新的分段檔"""
+        os.makedirs(self.root, exist_ok=True)
+        while True:
+            self._segment_no += 1
+            name = f"pages-{self.writer_id}-{self._segment_no:05d}"
+            path = os.path.join(self.root, name + SEGMENT_SUFFIX)
+            if not os.path.exists(path):
+                break
+        self._segment_path = path
+        self._segment_size = 0
+
+    def append(self, url, body, source, kind='article', status=200, content_type=None):
+        """附加一筆網頁到封存，回傳索引資料
+
+        body 應為伺服器回傳的原始 bytes，與記錄的 Content-Type（含 charset）一致。
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        fetched_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        header = (
+            "WARC/1.0\r\n"
+            "WARC-Type: resource\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {fetched_at}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"Content-Type: {content_type or 'text/html; charset=utf-8'}\r\n"
+            f"X-Crawl-Source: {source}\r\n"
+            f"X-Crawl-Kind: {kind}\r\n"
+            f"X-HTTP-Status: {status}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        ).encode('utf-8')
+        record = gzip.compress(header + body + b"\r\n\r\n")
+
+        with self._lock:
+            if self._segment_path is None or self._segment_size + len(record) > self.segment_max_bytes:
+                self._open_segment()
+
+            with open(self._segment_path, 'ab') as f:
+                offset = f.tell()
+                f.write(record)
+            self._segment_size = offset + len(record)
+
+            entry = {
+                'url': url,
+                'source': source,
+                'kind': kind,
+                'status': status,
+                'date': fetched_at,
+                'segment': os.path.basename(self._segment_path),
+                'offset': offset,
+                'length': len(record),
+            }
+            index_path = self._segment_path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+            with open(index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        return entry
+
+    def iter_index(self, source=None, kind=None):
+        """依序讀出所有索引資料"""
+        if not os.path.isdir(self.root):
+            return
+        for name in sorted(os.listdir(self.root)):
+            if not name.endswith(INDEX_SUFFIX):
+                continue
+            with open(os.path.join(self.root, name), encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if source and entry['source'] != source:
+                        continue
+                    if kind and entry['kind'] != kind:
+                        continue
+                    yield entry
+
+    def latest_entries(self, source=None, kind='article'):
+        """每個 URL 只取最新一次抓取的索引資料"""
+        latest = {}
+        for entry in self.iter_index(source=source, kind=kind):
+            current = latest.get(entry['url'])
+            if current is None or entry['date'] >= current['date']:
+                latest[entry['url']] = entry
+        return list(latest.values())
+
+    def expire_segments(self, older_than):
+        """刪除最後寫入時間早於 older_than（datetime）的分段檔與索引，回傳 (檔案數, bytes)"""
+        if not os.path.isdir(self.root):
+            return 0, 0
+        cutoff = older_than.timestamp()
+        removed = freed = 0
+        for name in os.listdir(self.root):
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+            path = os.path.join(self.root, name)
+            stat = os.stat(path)
+            # 寫入中的分段檔修改時間一定較新，不會被刪除
+            if stat.st_mtime >= cutoff or path == self._segment_path:
+                continue
+            index_path = path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+            # 先刪索引，重新解析時就不會讀到已刪除分段的記錄
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            os.remove(path)
+            removed += 1
+            freed += stat.st_size
+        return removed, freed
+
+    def read(self, entry):
+        """依索引讀回單筆記錄"""
+        path = os.path.join(self.root, entry['segment'])
+        with open(path, 'rb') as f:
+            f.seek(entry['offset'])
+            raw = gzip.decompress(f.read(entry['length']))
+
+        head, _, body = raw.partition(b"\r\n\r\n")
+        headers = {}
+        for line in head.decode('utf-8').split("\r\n")[1:]:
+            key, _, value = line.partition(': ')
+            headers[key] = value
+
+        length = int(headers.get('Content-Length', len(body)))
+        return {
+            'url': headers.get('WARC-Target-URI'),
+            'date': headers.get('WARC-Date'),
+            'source': headers.get('X-Crawl-Source'),
+            'kind': headers.get('X-Crawl-Kind'),
+            'status': int(headers.get('X-HTTP-Status', 200)),
+            'content_type': headers.get('Content-Type'),
+            'body': body[:length],
+            'html': _decode(body[:length], headers.get('Content-Type')),
+        }
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """取得共用的封存實例"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+        return _archive
+
+
+def archive_page(url, body, source, kind='article', status=200, content_type=None):
+    """封存抓到的網頁，未啟用或寫入失敗時不影響爬蟲"""
+    if not ARCHIVE_ENABLED:
+        return None
+    try:
+        return get_archive().append(url, body, source, kind=kind, status=status, content_type=content_type)
+    except OSError as e:
+        logger.error("[Archive] 封存網頁失敗 %s: %s", url, e, extra={'url': url})
+        return None
+
+
+async def archive_page_async(url, body, source, kind='article', status=200, content_type=None):
+    """在執行緒中封存，壓縮與寫檔不會佔用爬蟲的事件迴圈"""
+    if not ARCHIVE_ENABLED:
+        return None
+    return await asyncio.to_thread(archive_page, url, body, source, kind, status, content_type)
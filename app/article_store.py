@@ -0,0 +1,168 @@
+import re
+import threading
+import unicodedata
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from models import Article, CrawlJob, Tag, TagAlias
+from models.article import content_digest
+from postprocess import clean_text
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def clean_tag_name(name: str):
+    """標籤顯示名稱：NFKC 正規化（全形轉半形）並整理空白"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', name or '')).strip()
+
+
+def tag_key(name: str):
+    """比對標籤用的標準形式：不分大小寫、全半形與空白差異"""
+    return clean_tag_name(name).casefold()
+
+
+class TagResolver:
+    """把標籤名稱對應到標準標籤
+
+    對應關係存在 tag_aliases，並快取在記憶體中（排程器會在多個執行緒同時寫入，以 lock 保護）。
+    快取的標籤若已被合併刪除，會自動回到資料庫重新查詢。
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+    def _remember(self, key, tag_id):
+        with self._lock:
+            self._ids[key] = tag_id
+
+    def resolve(self, db: Session, name: str):
+        """取得標籤，不存在時建立（不會 commit）"""
+        key = tag_key(name)
+        if not key:
+            return None
+
+        with self._lock:
+            tag_id = self._ids.get(key)
+        tag = db.get(Tag, tag_id) if tag_id else None
+        if tag:
+            return tag
+
+        alias = db.get(TagAlias, key)
+        tag = alias.tag if alias else None
+        if not tag:
+            # 還沒有別名的舊標籤（merge_tags.py 執行前建立的）
+            tag = db.query(Tag).filter(func.lower(Tag.name) == key).order_by(Tag.id).first()
+        try:
+            # 其他 worker 可能同時建立同一個標籤，衝突時只退回這個 savepoint
+            with db.begin_nested():
+                if not tag:
+                    tag = Tag(name=clean_tag_name(name))
+                    db.add(tag)
+                    db.flush()
+                if not alias:
+                    db.add(TagAlias(alias=key, tag_id=tag.id))
+                    db.flush()
+        except IntegrityError:
+            alias = db.get(TagAlias, key)
+            tag = alias.tag if alias else db.query(Tag).filter(Tag.name == clean_tag_name(name)).one()
+        self._remember(key, tag.id)
+        return tag
+
+
+TAG_RESOLVER = TagResolver()
+
+
+def resolve_tag(db: Session, name: str):
+    """取得標準標籤，不存在時建立（不會 commit）"""
+    return TAG_RESOLVER.resolve(db, name)
+
+
+def resolve_tags(db: Session, names):
+    """把標籤名稱列表轉成不重複的標準標籤列表（保持原順序）"""
+    tags = {}
+    for name in names or []:
+        tag = resolve_tag(db, name)
+        if tag:
+            tags.setdefault(tag.id, tag)
+    return list(tags.values())
+
+
+def _same_content(article: Article, parsed: dict):
+    """以雜湊比對標題與內文；已整理過的文章儲存的是整理後的內容，也要與整理後的解析結果比對"""
+    if article.title == parsed['title'] and article.content_hash == content_digest(parsed['content']):
+        return True
+    return (article.processed_at is not None
+            and article.title == clean_text(parsed['title'])
+            and article.content_hash == content_digest(clean_text(parsed['content'])))
+
+
+def is_purged(db: Session, url: str):
+    """網址是否已被保留政策清除（retention 會在佇列留下 status='purged' 的紀錄）"""
+    return db.scalar(
+        select(CrawlJob.id).where(CrawlJob.url == url, CrawlJob.status == 'purged')
+    ) is not None
+
+
+def upsert_article(db: Session, source: str, url: str, parsed: dict):
+    """依 URL 新增或更新文章，回傳 'created'、'updated'、'unchanged' 或 'purged'（不會 commit）
+
+    內文沒有變更時不改寫內文，但標籤、摘要與分類仍以這次解析的結果為準；
+    已被保留政策清除的文章不會重新寫入。
+    """
+    article = db.query(Article).filter(Article.url == url).first()
+    # 清除過的文章已不存在（delete / archive）或沒有內文（strip），其他文章不必多查一次
+    if (article is None or article.content_length is None) and is_purged(db, url):
+        return 'purged'
+    # 先取得標籤：建立標籤時的 savepoint 不應包含文章的變更
+    tags = resolve_tags(db, parsed.get('tags', []))
+    status = 'updated'
+    if not article:
+        article = Article(url=url, source=source)
+        db.add(article)
+        status = 'created'
+
+    # 以雜湊比對內文，沒有變更時不必載入或改寫內文
+    if status == 'created' or not _same_content(article, parsed):
+        article.title = parsed['title']
+        article.content = parsed['content']
+        # 內文已改寫，deferred 模式下需要重新整理
+        article.processed_at = parsed.get('processed_at')
+    for field in ('summary', 'category'):
+        if parsed.get(field) is not None:
+            setattr(article, field, parsed[field])
+    article.tags = tags
+
+    # 設定相同的值不算變更，標籤集合相同也不算
+    if status == 'updated' and not db.is_modified(article):
+        status = 'unchanged'
+    db.flush()
+    return status
+
+
+def list_articles(db: Session, source: str = None, limit: int = 20, offset: int = 0):
+    """依建立時間由新到舊列出文章，標籤以一次 selectin 查詢批次載入（不載入內文）"""
+    query = db.query(Article).options(selectinload(Article.tags))
+    if source:
+        query = query.filter(Article.source == source)
+    return query.order_by(Article.created_at.desc(), Article.id.desc()).offset(offset).limit(limit).all()
+
+
+def article_to_dict(article: Article):
+    """API 與匯出共用的文章欄位（標籤需先以 selectinload 載入，避免逐篇查詢）"""
+    return {
+        'id': article.id,
+        'title': article.title,
+        'url': article.url,
+        'category': article.category,
+        'summary': article.summary,
+        'source': article.source,
+        'tags': [tag.name for tag in article.tags],
+        'content_length': article.content_length,
+        'created_at': article.created_at.isoformat() if article.created_at else None,
+        'updated_at': article.updated_at.isoformat() if article.updated_at else None,
+    }
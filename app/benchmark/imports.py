@@ -0,0 +1,61 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 各入口實際會 import 的模組
+ENTRY_POINTS = {
+    'cli': 'cli',
+    'check': 'check_articles',
+    'export': 'export_ndjson',
+    'scrape_all': 'scrape_all',
+    'worker': 'worker',
+    'api': 'main',
+}
+
+_IMPORTTIME = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)')
+
+
+def time_import(module, repeat):
+    """在全新的直譯器中 import 模組，回傳每次的耗時（秒），包含直譯器啟動"""
+    env = {**os.environ, 'SCHEDULER_ENABLED': '0'}
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', f'import {module}'], cwd=APP_DIR, env=env, check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def top_imports(module, limit):
+    """以 -X importtime 找出累計耗時最多的套件（不含入口模組本身）"""
+    env = {**os.environ, 'SCHEDULER_ENABLED': '0'}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=APP_DIR, env=env, capture_output=True, text=True, check=True)
+    packages = {}
+    for match in _IMPORTTIME.finditer(result.stderr):
+        cumulative, root = int(match.group(2)), match.group(3).split('.')[0]
+        # 同一個套件取最外層（累計值最大）的那一筆，避免重複計算子模組
+        if root not in (module, 'site', 'encodings'):
+            packages[root] = max(packages.get(root, 0), cumulative)
+    return sorted(packages.items(), key=lambda item: -item[1])[:limit]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="量測各入口的啟動（import）時間")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5, help="列出耗時最多的套件數")
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_import('os', args.repeat))
+    print(f"直譯器啟動：{baseline * 1000:.0f} ms")
+    print(f"{'entry':<12}{'median ms':>12}{'import ms':>12}  最慢的套件")
+    for name, module in ENTRY_POINTS.items():
+        median = statistics.median(time_import(module, args.repeat))
+        slowest = ', '.join(f"{pkg} {us / 1000:.0f}ms" for pkg, us in top_imports(module, args.top))
+        print(f"{name:<12}{median * 1000:>12.0f}{(median - baseline) * 1000:>12.0f}  {slowest}")
@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from benchmark.server import StandInSite
+from scrapers import mem, netadmin, twocm
+
+PARSERS = {'netadmin': netadmin, '2cm': twocm, 'MEM': mem}
+
+
+def measure(parse, html, mode, repeat):
+    """回傳每頁平均解析時間（秒）與單次解析的記憶體峰值（bytes）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(html, mode=mode)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    parse(html, mode=mode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="比較 full / fast 兩種文章解析模式")
+    parser.add_argument('--paragraphs', type=int, default=30, help="每篇文章的段落數")
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    site = StandInSite(paragraphs=args.paragraphs)
+    print(f"{'source':<10}{'full ms':>10}{'fast ms':>10}{'full KB':>10}{'fast KB':>10}")
+    for source, module in PARSERS.items():
+        html = site.article_html(source, 1)
+        if module.parse_article(html, mode='fast') != module.parse_article(html, mode='full'):
+            print(f"{source}: fast 與 full 的結果不同")
+        full_time, full_peak = measure(module.parse_article, html, 'full', args.repeat)
+        fast_time, fast_peak = measure(module.parse_article, html, 'fast', args.repeat)
+        print(f"{source:<10}{full_time * 1000:>10.2f}{fast_time * 1000:>10.2f}"
+              f"{full_peak / 1024:>10.0f}{fast_peak / 1024:>10.0f}")
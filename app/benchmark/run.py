@@ -0,0 +1,225 @@
+import warnings
+from bs4.builder import XMLParsedAsHTMLWarning
+
+# 忽略 BeautifulSoup 的 XML/HTML 警告
+warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from benchmark.server import site_urls
+
+# 各來源的爬蟲進入點
+SCRAPERS = {
+    'netadmin': 'scrape_netadmin',
+    '2cm': 'scrape_2cm',
+    'MEM': 'scrape_mem',
+}
+
+
+def percentile(samples, q):
+    """取第 q 百分位數（最近秩法）"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _run_scraper(source, base_url, database_url, archive_dir, queue):
+    """在獨立的子程序中執行單一爬蟲，量測時間、CPU 與記憶體"""
+    os.environ['ARCHIVE_ENABLED'] = '1' if archive_dir else '0'
+    if archive_dir:
+        os.environ['ARCHIVE_DIR'] = archive_dir
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    import metrics
+
+    # 額外記錄每個請求從送出到收到回應標頭的時間，用來計算百分位數
+    latencies = []
+    build_trace_config = metrics.trace_config
+
+    def recording_trace_config():
+        config = build_trace_config()
+
+        async def on_request_start(session, ctx, params):
+            ctx.bench_start = time.perf_counter()
+
+        async def on_request_end(session, ctx, params):
+            latencies.append(time.perf_counter() - ctx.bench_start)
+
+        config.on_request_start.append(on_request_start)
+        config.on_request_end.append(on_request_end)
+        return config
+
+    metrics.trace_config = recording_trace_config
+
+    from sqlalchemy import create_engine
+    from database import Base, SessionLocal
+    from log_config import setup_logging
+    from sources import load_source
+    import models  # noqa: F401  註冊所有資料表
+
+    setup_logging()
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    SessionLocal.configure(bind=engine)
+
+    module = load_source(source)
+    for name, value in site_urls(base_url)[source].items():
+        setattr(module, name, value)
+    scrape = getattr(module, SCRAPERS[source])
+
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    asyncio.run(scrape(batch_size=50))
+    elapsed = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    requests = sum(value for _, value in metrics.HTTP_REQUESTS.samples())
+    articles = sum(value for name, value in metrics.ARTICLES.samples() if 'result="failed"' not in name)
+    queue.put({
+        'source': source,
+        'elapsed': elapsed,
+        'requests': requests,
+        'articles': articles,
+        'pages_per_sec': requests / elapsed if elapsed else None,
+        'articles_per_sec': articles / elapsed if elapsed else None,
+        'latency_p50': percentile(latencies, 50),
+        'latency_p99': percentile(latencies, 99),
+        'cpu_seconds': (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime),
+        # Linux 的 ru_maxrss 單位是 KB，macOS 是 bytes
+        'peak_rss_mb': after.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024),
+    })
+
+
+def _wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"測試伺服器沒有在 {timeout} 秒內啟動")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def run_benchmark(sources, pages=100, latency=0.0, jitter=0.0, error_rate=0.0, paragraphs=30,
+                  database_url=None, archive=False, seed=0):
+    """啟動本機測試網站，依序以獨立子程序執行各爬蟲並收集結果"""
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'benchmark.server', '--port', str(port), '--pages', str(pages),
+         '--latency', str(latency), '--jitter', str(jitter), '--error-rate', str(error_rate),
+         '--paragraphs', str(paragraphs), '--seed', str(seed)],
+        cwd=APP_DIR,
+    )
+    results = {}
+    try:
+        _wait_for_port('127.0.0.1', port)
+        base_url = f"http://127.0.0.1:{port}"
+        context = multiprocessing.get_context('spawn')
+
+        with tempfile.TemporaryDirectory(prefix='bench-') as workdir:
+            for source in sources:
+                url = database_url or f"sqlite:///{os.path.join(workdir, f'{source}.db')}"
+                archive_dir = os.path.join(workdir, f'archive-{source}') if archive else None
+                queue = context.Queue()
+                process = context.Process(target=_run_scraper, args=(source, base_url, url, archive_dir, queue))
+                process.start()
+                results[source] = queue.get()
+                process.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'config': {
+            'pages': pages, 'latency': latency, 'jitter': jitter, 'error_rate': error_rate,
+            'paragraphs': paragraphs, 'archive': archive, 'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else '-'
+
+
+def print_report(report, baseline=None):
+    """輸出結果表格，有 baseline 時加上變化百分比"""
+    columns = [
+        ('pages_per_sec', 'pages/s', '.1f'),
+        ('articles_per_sec', 'articles/s', '.1f'),
+        ('latency_p50', 'p50 ms', '.1f'),
+        ('latency_p99', 'p99 ms', '.1f'),
+        ('cpu_seconds', 'CPU s', '.2f'),
+        ('peak_rss_mb', 'RSS MB', '.1f'),
+    ]
+    print(f"設定: {report['config']}")
+    print(f"{'source':<10}" + ''.join(f"{title:>16}" for _, title, _ in columns))
+    for source, result in report['results'].items():
+        row = f"{source:<10}"
+        base = (baseline or {}).get('results', {}).get(source, {})
+        for key, _, spec in columns:
+            value = result.get(key)
+            scale = 1000 if key.startswith('latency') and value is not None else 1
+            cell = _fmt(value * scale if value is not None else None, spec)
+            if base.get(key) and value is not None:
+                cell += f" ({(value - base[key]) / base[key] * 100:+.0f}%)"
+            row += f"{cell:>16}"
+        print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="離線爬蟲效能測試")
+    parser.add_argument('--source', action='append', choices=sorted(SCRAPERS), help="只測指定來源（可重複）")
+    parser.add_argument('--pages', type=int, default=100, help="每個來源的文章數")
+    parser.add_argument('--latency', type=float, default=0.0, help="伺服器平均延遲（秒）")
+    parser.add_argument('--jitter', type=float, default=0.0, help="延遲標準差（秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="回傳 500 的比例")
+    parser.add_argument('--paragraphs', type=int, default=30, help="每篇文章的段落數")
+    parser.add_argument('--database-url', help="預設使用暫存的 SQLite")
+    parser.add_argument('--archive', action='store_true', help="同時寫入原始網頁封存")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="把結果寫成 JSON")
+    parser.add_argument('--compare', help="與先前輸出的 JSON 比較")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.source or list(SCRAPERS), args.pages, args.latency, args.jitter, args.error_rate,
+        args.paragraphs, args.database_url, args.archive, args.seed
+    )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
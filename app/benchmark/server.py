@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import os
+import random
+from aiohttp import web
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+NETADMIN_CATEGORIES = ['feature', 'news', 'technology']
+NETADMIN_PER_PAGE = 20
+
+TAG_POOL = ['資安', '雲端', 'AI', '網路', '零信任', 'Kubernetes', '5G', 'IoT', '邊緣運算', '半導體',
+            '智慧製造', '儲存', 'SASE', '備份', '虛擬化', 'Wi-Fi 7', 'DevOps', '機器學習']
+
+# 各來源文章頁的範本與標籤格式
+ARTICLE_PAGES = {
+    'netadmin': ('netadmin_article.html', '        <span class="pageTag">{0}</span>'),
+    '2cm': ('twocm_article.html', '        <span class="pageTag" onclick="goTag(\'{0}\')">{0}</span>'),
+    'MEM': ('mem_article.html', '        <li><a href="/mem/tag/{0}/">{0}</a></li>'),
+}
+
+PARAGRAPH = (
+    "隨著企業數位轉型腳步加快，IT 部門面臨的挑戰也愈來愈多元。從混合雲架構的管理、端點裝置的資安防護，"
+    "到 AI 工作負載對運算資源的需求，每一項都考驗著既有的基礎架構與維運流程。本文整理了實際導入時的評估重點，"
+    "並以案例說明如何在有限的預算與人力下，逐步建立可擴充且易於維護的環境。"
+)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class StandInSite:
+    """模擬 NetAdmin / 2CM / MEM 網站的本機伺服器，可設定延遲、錯誤率與文章數"""
+
+    def __init__(self, pages=100, latency=0.0, jitter=0.0, error_rate=0.0, paragraphs=30, seed=0):
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.paragraphs = paragraphs
+        self.random = random.Random(seed)
+        self.fixtures = {name: load_fixture(name) for name in os.listdir(FIXTURE_DIR)}
+        self.requests = 0
+
+    def article_tags(self, source, article_id):
+        """文章的標籤（同一篇文章每次都相同）"""
+        return random.Random(f"{source}-{article_id}").sample(TAG_POOL, 4)
+
+    def article_html(self, source, article_id):
+        """產生文章頁的 HTML，伺服器、測試與解析 benchmark 共用"""
+        template, tag_html = ARTICLE_PAGES[source]
+        tags = self.article_tags(source, article_id)
+        body = '\n'.join(f"        <p>{PARAGRAPH}（第 {i + 1} 段）</p>" for i in range(self.paragraphs))
+        return self._render(template, {
+            '__TITLE__': f"{source} 測試文章 {article_id}：{tags[0]}與{tags[1]}的實務觀察",
+            '__LEAD__': f"本文為第 {article_id} 篇測試文章，探討{tags[0]}、{tags[1]}在企業環境中的應用。",
+            '__BODY__': body,
+            '__TAGS__': '\n'.join(tag_html.format(tag) for tag in tags),
+        })
+
+    def _render(self, template, fields):
+        html = self.fixtures[template]
+        for key, value in fields.items():
+            html = html.replace(key, value)
+        return html
+
+    @web.middleware
+    async def conditions(self, request, handler):
+        """注入延遲與錯誤"""
+        self.requests += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.random.gauss(self.latency, self.jitter)))
+        if self.error_rate and self.random.random() < self.error_rate:
+            return web.Response(status=500, text='Internal Server Error')
+        return await handler(request)
+
+    async def netadmin_listing(self, request):
+        category = request.match_info['category']
+        page = int(request.query.get('page', 1))
+        start = (page - 1) * NETADMIN_PER_PAGE
+        ids = range(start, min(start + NETADMIN_PER_PAGE, self.pages))
+        items = '\n'.join(
+            f'        <li class="thumbnail pageList"><a href="/netadmin/zh-tw/{category}/{i}">'
+            f'<h4 class="pageListH4">{category} 測試文章 {i}</h4></a><p class="text-muted">2024-12-20</p></li>'
+            for i in ids
+        )
+        return web.Response(text=self._render('netadmin_listing.html', {'__ITEMS__': items}), content_type='text/html')
+
+    async def netadmin_article(self, request):
+        return web.Response(text=self.article_html('netadmin', request.match_info['id']), content_type='text/html')
+
+    async def twocm_rss(self, request):
+        base = f"{request.scheme}://{request.host}"
+        items = '\n'.join(
+            f'    <item><title>2cm 測試文章 {i}</title><link>{base}/2cm/zh-tw/tech/{i}</link>'
+            f'<pubDate>Fri, 20 Dec 2024 08:00:00 +0800</pubDate></item>'
+            for i in range(self.pages)
+        )
+        return web.Response(text=self._render('twocm_rss.xml', {'__ITEMS__': items}), content_type='application/rss+xml')
+
+    async def twocm_article(self, request):
+        return web.Response(text=self.article_html('2cm', request.match_info['id']), content_type='text/html')
+
+    async def mem_home(self, request):
+        home = f"{request.scheme}://{request.host}/mem/"
+        items = '\n'.join(
+            f'    <div class="mem-post-item"><a href="{home}post-{i}/">MEM 測試文章 {i}</a></div>'
+            for i in range(self.pages)
+        )
+        return web.Response(text=self._render('mem_home.html', {'__ITEMS__': items, '__HOME__': home}),
+                            content_type='text/html')
+
+    async def mem_article(self, request):
+        return web.Response(text=self.article_html('MEM', request.match_info['id']), content_type='text/html')
+
+    def create_app(self):
+        app = web.Application(middlewares=[self.conditions])
+        app.router.add_get('/netadmin/zh-tw/{category}/', self.netadmin_listing)
+        app.router.add_get('/netadmin/zh-tw/{category}/{id}', self.netadmin_article)
+        app.router.add_get('/2cm/Rss.aspx', self.twocm_rss)
+        app.router.add_get('/2cm/zh-tw/tech/{id}', self.twocm_article)
+        app.router.add_get('/mem/', self.mem_home)
+        app.router.add_get('/mem/post-{id}/', self.mem_article)
+        return app
+
+
+def site_urls(base):
+    """各爬蟲模組在本機伺服器上對應的網址設定"""
+    return {
+        'netadmin': {
+            'BASE_URL': base,
+            'CATEGORIES': [f"{base}/netadmin/zh-tw/{c}/" for c in NETADMIN_CATEGORIES],
+        },
+        '2cm': {'RSS_URL': f"{base}/2cm/Rss.aspx"},
+        'MEM': {'HOME_URL': f"{base}/mem/"},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="本機測試網站伺服器")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=100, help="每個來源的文章數")
+    parser.add_argument('--latency', type=float, default=0.0, help="平均延遲（秒）")
+    parser.add_argument('--jitter', type=float, default=0.0, help="延遲標準差（秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="回傳 500 的比例")
+    parser.add_argument('--paragraphs', type=int, default=30, help="每篇文章的段落數")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    site = StandInSite(args.pages, args.latency, args.jitter, args.error_rate, args.paragraphs, args.seed)
+    web.run_app(site.create_app(), host=args.host, port=args.port, access_log=None, print=None)
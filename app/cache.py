@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """有存活時間與容量上限的 LRU 快取（執行緒安全，同步端點會在執行緒池中呼叫）"""
+
+    def __init__(self, maxsize=256, ttl=30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # 每次 clear 加一；產生內容期間快取被清除過，就不存入過時的內容
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value, generation=None):
+        """存入內容；generation 與目前不同（取得後快取被清除過）時略過"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+# API 回應快取；其他程序（worker、reparse）寫入的資料最多延遲 TTL 秒才會出現
+RESPONSE_CACHE = TTLCache(
+    maxsize=int(os.getenv('RESPONSE_CACHE_SIZE', '256')),
+    ttl=float(os.getenv('RESPONSE_CACHE_TTL', '30')),
+)
+
+
+def invalidate(*args, **kwargs):
+    """清除所有快取的回應（資料有變動時呼叫，可直接當作排程器的 listener）"""
+    RESPONSE_CACHE.clear()
+    logger.debug("[Cache] 已清除回應快取")
+
+
+def _cache_key(request: Request):
+    return request.url.path + '?' + urlencode(sorted(request.query_params.multi_items()))
+
+
+def _not_modified(request: Request, etag):
+    tags = [tag.strip() for tag in request.headers.get('if-none-match', '').split(',')]
+    return etag in tags or '*' in tags
+
+
+def cached_json(request: Request, build):
+    """回傳快取的 JSON 回應；沒有快取時呼叫 build() 產生，並附上 ETag
+
+    用戶端帶 If-None-Match 且內容沒變時回傳 304，不必再傳一次內容。
+    """
+    key = _cache_key(request)
+    entry = RESPONSE_CACHE.get(key)
+    if entry is None:
+        # 在 build() 之前取得，build() 期間資料變動（invalidate）時不會存入舊內容
+        generation = RESPONSE_CACHE.generation
+        body = json.dumps(jsonable_encoder(build()), ensure_ascii=False).encode('utf-8')
+        entry = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        RESPONSE_CACHE.set(key, entry, generation)
+
+    body, etag = entry
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
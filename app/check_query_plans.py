@@ -0,0 +1,82 @@
+import json
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from database import get_db
+from models import Article, Tag, article_tags
+
+# 主要查詢與預期使用的索引
+CHECKS = [
+    ('以 URL 檢查文章是否存在',
+     select(Article.id).where(Article.url == 'https://www.netadmin.com.tw/netadmin/zh-tw/news/1'),
+     'articles_url_key'),
+    ('不分大小寫查詢標籤',
+     select(Tag.id).where(func.lower(Tag.name) == func.lower('AI')),
+     'ix_tags_name_lower'),
+    ('標籤的文章',
+     select(article_tags.c.article_id).where(article_tags.c.tag_id == 1),
+     'ix_article_tags_tag_id'),
+    ('最新文章',
+     select(Article.id, Article.title).order_by(Article.created_at.desc()).limit(5),
+     'ix_articles_created_at'),
+    ('來源的最新文章',
+     select(Article.id, Article.title).where(Article.source == 'netadmin')
+     .order_by(Article.created_at.desc()).limit(20),
+     'ix_articles_source_created_at'),
+    ('依分類統計',
+     select(Article.category, func.count()).group_by(Article.category),
+     'ix_articles_category'),
+    ('最近更新的文章',
+     select(Article.id).where(Article.updated_at > datetime(2024, 1, 1)),
+     'ix_articles_updated_at'),
+    ('尚未整理的文章',
+     select(Article.id).where(Article.processed_at.is_(None), Article.id > 0).order_by(Article.id).limit(500),
+     'ix_articles_unprocessed'),
+    ('過期文章',
+     select(Article.id).where(Article.created_at < datetime.now() - timedelta(days=365)).limit(1000),
+     'ix_articles_created_at'),
+]
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _walk(child)
+
+
+def explain(db, query):
+    """取得查詢計畫（停用循序掃描，確認索引「可以」被使用，而不受資料量影響）"""
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+    db.execute(text('SET LOCAL enable_seqscan = off'))
+    result = db.execute(text(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return plan[0]['Plan']
+
+
+def check_query_plans():
+    db = next(get_db())
+    failures = 0
+    try:
+        for name, query, expected_index in CHECKS:
+            plan = explain(db, query)
+            nodes = list(_walk(plan))
+            seq_scans = [n['Relation Name'] for n in nodes if n['Node Type'] == 'Seq Scan']
+            indexes = {n['Index Name'] for n in nodes if 'Index Name' in n}
+
+            ok = expected_index in indexes and not seq_scans
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {name}: 索引 {sorted(indexes) or '-'}"
+                  + (f"，循序掃描 {seq_scans}" if seq_scans else ''))
+        db.rollback()
+    finally:
+        db.close()
+
+    if failures:
+        print(f"\n{failures} 個查詢沒有使用預期的索引")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    from cli import main
+    sys.exit(main(['check-plans'] + sys.argv[1:]))
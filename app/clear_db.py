@@ -1,21 +1,40 @@
-from database import Base, engine
-from models import Article, Tag, article_tags
+from database import Base, get_engine
+from stats import create_stats_views, drop_stats_views
+import models  # noqa: F401  註冊所有資料表
 
-print("開始清除資料庫...")
-
-try:
-    # 刪除所有表格
-    print("正在刪除表格...")
-    Base.metadata.drop_all(bind=engine)
-    print("表格已刪除")
+def clear_db():
+    engine = get_engine()
+    # 統計的 materialized view 只有 PostgreSQL 有
+    with_views = engine.dialect.name == 'postgresql'
+    print("開始清除資料庫...")
     
-    # 重新建立表格
-    print("正在重新建立表格...")
-    Base.metadata.create_all(bind=engine)
-    print("表格已重新建立")
+    try:
+        # 統計 view 依賴資料表，要先刪除，否則 drop_all 會失敗
+        if with_views:
+            with engine.begin() as conn:
+                drop_stats_views(conn)
+
+        # 刪除所有表格
+        print("正在刪除表格...")
+        Base.metadata.drop_all(bind=engine)
+        print("表格已刪除")
+        
+        # 重新建立表格
+        print("正在重新建立表格...")
+        Base.metadata.create_all(bind=engine)
+        print("表格已重新建立")
+
+        # create_all 不會建立 view，依目前的定義重建統計
+        if with_views:
+            with engine.begin() as conn:
+                create_stats_views(conn)
+            print("統計 view 已重新建立")
+        
+    except Exception as e:
+        print(f"發生錯誤: {str(e)}")
+        raise
     
-except Exception as e:
-    print(f"發生錯誤: {str(e)}")
-    raise
+    print("資料庫清除完成")
 
-print("資料庫清除完成") 
\ No newline at end of file
+if __name__ == "__main__":
+    clear_db()
@@ -0,0 +1,193 @@
+"""統一的命令列入口：python cli.py <指令>
+
+各指令需要的模組（爬蟲、bs4、aiohttp、資料庫模型）在執行該指令時才 import，
+短時間的排程工作與 worker 容器啟動時不必載入用不到的套件。
+"""
+import argparse
+import os
+import sys
+
+# 與 sources.SOURCE_MODULES 相同；寫在這裡避免為了顯示說明而 import 其他模組
+# 各模組的 python xxx.py 也都轉交給這裡的 main()，參數只在這個檔案定義
+SOURCES = ('2cm', 'MEM', 'netadmin')
+
+
+def _run_async(coro):
+    import asyncio
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    return asyncio.run(coro)
+
+
+def cmd_scrape(args):
+    import warnings
+    from bs4.builder import XMLParsedAsHTMLWarning
+    warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
+
+    if args.source == 'all':
+        from scrape_all import run_all_scrapers
+        _run_async(run_all_scrapers())
+        return
+
+    from sources import load_source
+    module = load_source(args.source)
+    scrape = {'netadmin': 'scrape_netadmin', '2cm': 'scrape_2cm', 'MEM': 'scrape_mem'}[args.source]
+    _run_async(getattr(module, scrape)(batch_size=args.batch_size))
+
+
+def cmd_worker(args):
+    from worker import run_worker
+    _run_async(run_worker(args.batch_size, args.poll_interval))
+
+
+def cmd_discover(args):
+    from worker import discover
+    _run_async(discover(args.source, args.refresh))
+
+
+def cmd_check(args):
+    from check_articles import check_articles
+    check_articles(refresh=args.refresh)
+
+
+def cmd_check_plans(args):
+    from check_query_plans import check_query_plans
+    return 0 if check_query_plans() else 1
+
+
+def cmd_export(args):
+    from export_ndjson import export_to_ndjson
+    export_to_ndjson()
+
+
+def cmd_clear_db(args):
+    from clear_db import clear_db
+    clear_db()
+
+
+def cmd_reparse(args):
+    from reparse import reparse
+    reparse(args.source, args.archive_dir, args.workers, args.chunk_size)
+
+
+def cmd_postprocess(args):
+    from postprocess import backfill
+    backfill(args.source, args.all, args.workers, args.batch_size)
+
+
+def cmd_merge_tags(args):
+    from merge_tags import merge_tags
+    merge_tags(dict(args.alias), args.dry_run)
+    if not args.dry_run:
+        print("合併完成後請執行 python cli.py check --refresh 更新標籤統計")
+
+
+def cmd_refresh_stats(args):
+    from stats import refresh_stats
+    refresh_stats()
+
+
+def cmd_retention(args):
+    from retention import expire_archive, expire_crawl_jobs, purge_articles, vacuum
+    if args.days is not None:
+        purge_articles(args.days, args.source, args.mode, args.batch_size, args.export_dir, args.pause, args.dry_run)
+    if args.dry_run:
+        return
+    if args.job_days is not None or args.purged_days is not None:
+        expire_crawl_jobs(args.job_days, args.batch_size, args.purged_days)
+    if args.archive_days is not None:
+        expire_archive(args.archive_days)
+    if args.vacuum:
+        vacuum()
+
+
+def _alias(value):
+    alias, _, canonical = value.partition('=')
+    if not alias or not canonical:
+        raise argparse.ArgumentTypeError("格式為 別名=標準名稱")
+    return alias, canonical
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="科技新聞爬蟲工具")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p = subparsers.add_parser('scrape', help="執行爬蟲")
+    p.add_argument('source', nargs='?', default='all', choices=('all',) + SOURCES)
+    p.add_argument('--batch-size', type=int, default=50)
+    p.set_defaults(func=cmd_scrape)
+
+    p = subparsers.add_parser('worker', help="領取並處理佇列中的工作")
+    p.add_argument('--batch-size', type=int, default=int(os.getenv('WORKER_BATCH_SIZE', '20')))
+    p.add_argument('--poll-interval', type=float, default=5.0)
+    p.set_defaults(func=cmd_worker)
+
+    p = subparsers.add_parser('discover', help="找出文章連結並加入佇列")
+    p.add_argument('--source', choices=SOURCES)
+    p.add_argument('--refresh', action='store_true', help="重新排入已完成的文章")
+    p.set_defaults(func=cmd_discover)
+
+    p = subparsers.add_parser('check', help="顯示文章統計")
+    p.add_argument('--refresh', action='store_true', help="先重新計算統計")
+    p.set_defaults(func=cmd_check)
+
+    p = subparsers.add_parser('check-plans', help="確認主要查詢使用預期的索引")
+    p.set_defaults(func=cmd_check_plans)
+
+    p = subparsers.add_parser('refresh-stats', help="重新計算統計")
+    p.set_defaults(func=cmd_refresh_stats)
+
+    p = subparsers.add_parser('export', help="匯出文章為 NDJSON")
+    p.set_defaults(func=cmd_export)
+
+    p = subparsers.add_parser('clear-db', help="刪除並重建所有資料表")
+    p.set_defaults(func=cmd_clear_db)
+
+    p = subparsers.add_parser('reparse', help="從封存重新解析文章")
+    p.add_argument('--source', choices=SOURCES, help="只處理指定來源")
+    p.add_argument('--archive-dir', help="封存目錄")
+    p.add_argument('--workers', type=int, help="解析程序數")
+    p.add_argument('--chunk-size', type=int, default=50)
+    p.set_defaults(func=cmd_reparse)
+
+    p = subparsers.add_parser('postprocess', help="整理文章內文、摘要與分類")
+    p.add_argument('--source', choices=SOURCES, help="只處理指定來源")
+    p.add_argument('--all', action='store_true', help="連已整理過的文章也重新處理")
+    p.add_argument('--workers', type=int, help="處理程序數")
+    p.add_argument('--batch-size', type=int, default=500)
+    p.set_defaults(func=cmd_postprocess)
+
+    p = subparsers.add_parser('merge-tags', help="合併重複的標籤並建立標籤別名")
+    p.add_argument('--alias', type=_alias, action='append', default=[], help="手動別名，例如 --alias k8s=Kubernetes（可重複）")
+    p.add_argument('--dry-run', action='store_true', help="只列出會合併的標籤")
+    p.set_defaults(func=cmd_merge_tags)
+
+    p = subparsers.add_parser('retention', help="依保留期限清除舊資料")
+    p.add_argument('--days', type=float, help="清除幾天前建立的文章")
+    p.add_argument('--source', choices=SOURCES, help="只處理指定來源")
+    # 與 retention.MODES 相同
+    p.add_argument('--mode', choices=('delete', 'archive', 'strip'), default=os.getenv('RETENTION_MODE', 'delete'))
+    p.add_argument('--batch-size', type=int, default=1000)
+    p.add_argument('--export-dir', help="archive 模式的匯出目錄")
+    p.add_argument('--pause', type=float, default=0.0, help="每批之間暫停的秒數")
+    p.add_argument('--job-days', type=float, help="清除幾天前完成的佇列工作")
+    p.add_argument('--purged-days', type=float, help="清除幾天前的已清除文章網址紀錄")
+    p.add_argument('--archive-days', type=float, help="清除幾天前的原始網頁封存")
+    p.add_argument('--vacuum', action='store_true', help="完成後執行 VACUUM (ANALYZE)")
+    p.add_argument('--dry-run', action='store_true', help="只計算會清除的文章數")
+    p.set_defaults(func=cmd_retention)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    from log_config import setup_logging
+    setup_logging()
+
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import Base
+import models  # noqa: F401  註冊所有資料表
+
+
+@pytest.fixture
+def db():
+    """每個測試各自使用一個空的 SQLite 記憶體資料庫"""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
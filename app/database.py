@@ -1,26 +1,51 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
 import os
+from sqlalchemy.orm import declarative_base, sessionmaker
 
-load_dotenv()
-
+# 未設定 DATABASE_URL 時使用（docker compose 網路內的資料庫）
 SQLALCHEMY_DATABASE_URL = "postgresql://user:password@db:5432/crawler_db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={
-        'port': 5432
-    }
-)
+_engine = None
+
+
+def database_url():
+    """資料庫連線字串：環境變數 DATABASE_URL（可寫在 .env）優先"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv('DATABASE_URL', SQLALCHEMY_DATABASE_URL)
+
+
+def get_engine():
+    """第一次使用時才建立 engine，只 import 模組不會連線或載入資料庫驅動"""
+    global _engine
+    if _engine is None:
+        from sqlalchemy import create_engine
+        _engine = create_engine(database_url())
+    return _engine
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class LazySessionmaker(sessionmaker):
+    """沒有另外指定 bind 時，建立 session 才取得 engine"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get('bind') is None and 'bind' not in local_kw:
+            local_kw['bind'] = get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+
+def __getattr__(name):
+    # 相容舊的 from database import engine
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
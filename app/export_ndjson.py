@@ -1,13 +1,20 @@
 import json
 from database import get_db
+from sqlalchemy.orm import selectinload, undefer
 from models.article import Article
 from datetime import datetime
 
 def export_to_ndjson():
     db = next(get_db())
     try:
-        # 取得所有文章
-        articles = db.query(Article).all()
+        # 逐批取得文章（內文預設延遲載入，匯出時一併查詢；標籤每批以一次查詢載入）
+        articles = (
+            db.query(Article)
+            .options(undefer(Article.content), selectinload(Article.tags))
+            .order_by(Article.id)
+            .yield_per(500)
+        )
+        count = 0
         
         # 建立輸出檔案名稱，包含時間戳記
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -24,13 +31,15 @@ def export_to_ndjson():
                     'summary': article.summary,
                     'content': article.content,
                     'source': article.source,
+                    'tags': [tag.name for tag in article.tags],
                     'created_at': article.created_at.isoformat() if article.created_at else None,
                     'updated_at': article.updated_at.isoformat() if article.updated_at else None
                 }
                 # 寫入一行 JSON
                 f.write(json.dumps(article_dict, ensure_ascii=False) + '\n')
+                count += 1
         
-        print(f"已匯出 {len(articles)} 篇文章到 {filename}")
+        print(f"已匯出 {count} 篇文章到 {filename}")
         
     finally:
         db.close()
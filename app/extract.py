@@ -0,0 +1,20 @@
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+
+# fast：只建立文章需要的節點；full：建立整份文件的 DOM（網站改版、選擇器失效時可切回比對）
+EXTRACT_MODE = os.getenv('EXTRACT_MODE', 'fast')
+
+
+def strainer(*classes):
+    """只保留 class 含有其中任一名稱的元素（連同整個子樹）"""
+    return SoupStrainer(class_=list(classes))
+
+
+def make_soup(html, parse_only, mode=None):
+    """解析文章頁面；fast 模式下不在 parse_only 範圍內的節點不會建立，CPU 與記憶體用量都較低
+
+    parse_only 只在最外層比對，符合的元素整個子樹都會保留，因此子元素的選擇器照常可用。
+    """
+    if (mode or EXTRACT_MODE) == 'full':
+        return BeautifulSoup(html, 'html.parser')
+    return BeautifulSoup(html, 'html.parser', parse_only=parse_only)
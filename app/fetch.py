@@ -0,0 +1,73 @@
+import os
+import aiohttp
+from archive import archive_page_async
+from metrics import HTTP_REJECTED, HTTP_RESPONSE_BYTES, HTTP_STAGE_SECONDS, timer
+
+# 單一回應最多讀取的大小；超過就中止，避免大型檔案佔滿記憶體
+MAX_BODY_BYTES = int(os.getenv('FETCH_MAX_BYTES', str(5 * 1024 * 1024)))
+CHUNK_SIZE = 64 * 1024
+# 每個爬蟲同時連線的上限（每個連線最多佔用 MAX_BODY_BYTES）；預設與 aiohttp 原本的上限相同
+FETCH_CONCURRENCY = int(os.getenv('FETCH_CONCURRENCY', '100'))
+
+# 爬蟲與 worker 共用的請求標頭
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'zh-TW,zh;q=0.9,en;q=0.8'
+}
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+XML_TYPES = ('application/rss+xml', 'application/atom+xml', 'application/xml', 'text/xml')
+# 各種頁面接受的 Content-Type；沒有 Content-Type 的回應一律接受
+ALLOWED_TYPES = {
+    'article': HTML_TYPES,
+    'listing': HTML_TYPES,
+    'rss': XML_TYPES + HTML_TYPES,
+}
+
+
+class PageRejected(Exception):
+    """回應的類型或大小不符，沒有讀取內容"""
+
+    def __init__(self, url, reason, detail):
+        super().__init__(f"{reason}: {detail} ({url})")
+        self.url = url
+        self.reason = reason
+
+
+def connector(**kwargs):
+    """建立依 FETCH_CONCURRENCY 限制連線數的 connector"""
+    kwargs.setdefault('limit', FETCH_CONCURRENCY)
+    return aiohttp.TCPConnector(**kwargs)
+
+
+def _reject(response, url, reason, detail):
+    HTTP_REJECTED.inc(host=response.url.host, reason=reason)
+    # 不讀取剩下的內容，直接關閉連線
+    response.close()
+    raise PageRejected(url, reason, detail)
+
+
+async def read_page(response, url, source, kind='article'):
+    """以串流方式讀取回應內容：先檢查類型與大小，超過上限就中止；記錄下載耗時與大小，並寫入原始網頁封存"""
+    host = response.url.host
+    content_type = response.headers.get('Content-Type')
+    if content_type and response.content_type not in ALLOWED_TYPES.get(kind, HTML_TYPES):
+        _reject(response, url, 'content_type', response.content_type)
+    if response.content_length is not None and response.content_length > MAX_BODY_BYTES:
+        _reject(response, url, 'too_large', f"{response.content_length} bytes")
+
+    body = bytearray()
+    with timer(HTTP_STAGE_SECONDS, host=host, stage='download'):
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            body.extend(chunk)
+            if len(body) > MAX_BODY_BYTES:
+                HTTP_RESPONSE_BYTES.inc(len(body), host=host)
+                _reject(response, url, 'too_large', f"超過 {MAX_BODY_BYTES} bytes")
+    HTTP_RESPONSE_BYTES.inc(len(body), host=host)
+
+    # 內容是串流讀取的，aiohttp 無法推測編碼；標頭沒有 charset 時以 UTF-8 解碼
+    text = body.decode(response.charset or 'utf-8', errors='replace')
+    # 封存伺服器回傳的原始內容，與記錄的 Content-Type 編碼一致
+    await archive_page_async(url, bytes(body), source, kind=kind, status=response.status, content_type=content_type)
+    return text
@@ -0,0 +1,74 @@
+import logging
+import os
+import threading
+import time
+
+# 記錄時可用 extra={...} 附加的結構化欄位
+STRUCTURED_FIELDS = ('source', 'url', 'status', 'count', 'job', 'worker_id', 'elapsed')
+
+
+class StructuredFormatter(logging.Formatter):
+    """在訊息後面附加 key=value 形式的結構化欄位"""
+
+    def format(self, record):
+        message = super().format(record)
+        fields = [f"{name}={getattr(record, name)}" for name in STRUCTURED_FIELDS if hasattr(record, name)]
+        return f"{message} {' '.join(fields)}" if fields else message
+
+
+class RateLimitFilter(logging.Filter):
+    """同一個訊息樣板在 interval 秒內最多輸出 burst 次，其餘略過並在下次輸出時註明略過數量
+
+    訊息以 logger 名稱加上未格式化的樣板（record.msg）分組，所以呼叫端要用
+    logger.info("... %s", value) 而不是 f-string。CRITICAL 不受限制。
+    """
+
+    def __init__(self, interval=60.0, burst=20):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows = {}
+        self._last_prune = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        """移除已過期、也沒有略過訊息要回報的視窗，避免 _windows 無限增長"""
+        self._windows = {
+            key: window for key, window in self._windows.items()
+            if now - window[0] < self.interval or window[2]
+        }
+        self._last_prune = now
+
+    def filter(self, record):
+        if record.levelno >= logging.CRITICAL:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_prune >= self.interval:
+                self._prune(now)
+            start, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.interval:
+                if suppressed:
+                    record.msg = f"{record.msg}（前 {self.interval:.0f} 秒略過 {suppressed} 筆相同訊息）"
+                start, count, suppressed = now, 0, 0
+            if count >= self.burst:
+                self._windows[key] = (start, count, suppressed + 1)
+                return False
+            self._windows[key] = (start, count + 1, suppressed)
+        return True
+
+
+def setup_logging(level=None):
+    """設定全域日誌：LOG_LEVEL 控制等級，LOG_RATE_INTERVAL / LOG_RATE_BURST 控制限流"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(StructuredFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    handler.addFilter(RateLimitFilter(
+        interval=float(os.getenv('LOG_RATE_INTERVAL', '60')),
+        burst=int(os.getenv('LOG_RATE_BURST', '20'))
+    ))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level or os.getenv('LOG_LEVEL', 'INFO').upper())
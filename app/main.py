@@ -1,14 +1,26 @@
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 import logging
+import os
+from sqlalchemy.orm import Session
+from article_store import article_to_dict, list_articles
+from cache import cached_json, invalidate
+from database import get_db
+from log_config import setup_logging
+from metrics import REGISTRY
+from postprocess import POSTPROCESS_MODE, backfill
+from retention import RETENTION_DAYS, apply_retention
+from scheduler import Scheduler, interval_from_env
+from stats import get_stats, refresh_stats
+from scrapers.mem import scrape_mem
 from scrapers.netadmin import scrape_netadmin
+from scrapers.twocm import scrape_2cm
+from worker import discover
 
 # 設定日誌
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -34,32 +46,83 @@ async def root():
         "timestamp": datetime.now().isoformat()
     }
 
-# 手動觸發爬蟲
-@app.post("/crawl/netadmin")
-async def crawl_netadmin(background_tasks: BackgroundTasks):
-    try:
-        articles = await scrape_netadmin()
-        return {
-            "status": "success",
-            "message": f"成功爬取 {len(articles)} 篇文章",
-            "data": articles
-        }
-    except Exception as e:
-        logger.error(f"爬蟲執行失敗: {str(e)}")
+# 排程器：每個來源依自己的間隔執行
+# CRAWL_MODE=queue 時只負責找出文章連結排入佇列，實際爬取交給 worker.py
+scheduler = Scheduler(max_concurrent=int(os.getenv('SCHEDULER_MAX_CONCURRENT', '1')))
+# 可由 /crawl 手動觸發的爬蟲工作；其他排程工作（統計、清理等）不對外開放
+CRAWL_JOBS = ('netadmin', '2cm', 'mem')
+if os.getenv('CRAWL_MODE', 'inline') == 'queue':
+    scheduler.add_job('netadmin', discover, interval_from_env('netadmin', 60), source='netadmin')
+    # 2CM 的文章會更新內容與標籤，已完成的工作每個間隔重新排入一次（與 inline 模式每次都更新相同）
+    scheduler.add_job('2cm', discover, interval_from_env('2cm', 60), source='2cm',
+                      refresh_after=interval_from_env('2cm', 60))
+    scheduler.add_job('mem', discover, interval_from_env('mem', 60), source='MEM')
+else:
+    scheduler.add_job('netadmin', scrape_netadmin, interval_from_env('netadmin', 60), batch_size=50)
+    scheduler.add_job('2cm', scrape_2cm, interval_from_env('2cm', 60), batch_size=50)
+    scheduler.add_job('mem', scrape_mem, interval_from_env('mem', 60), batch_size=50)
+scheduler.add_job('stats', refresh_stats, interval_from_env('stats', 5), exclusive=False)
+# deferred 模式下爬蟲只存原始內容，由排程定期整理
+if POSTPROCESS_MODE == 'deferred':
+    scheduler.add_job('postprocess', backfill, interval_from_env('postprocess', 10))
+# 設定 RETENTION_DAYS 時每天清除過期資料
+if RETENTION_DAYS:
+    scheduler.add_job('retention', apply_retention, interval_from_env('retention', 24 * 60))
+# 工作開始與結束時狀態和資料都可能改變，清除回應快取
+scheduler.add_listener(invalidate)
+
+@app.on_event("startup")
+async def start_scheduler():
+    if os.getenv('SCHEDULER_ENABLED', '1') != '0':
+        scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    await scheduler.shutdown()
+
+# 手動觸發爬蟲（背景執行，立即回應）
+@app.post("/crawl/{source}", status_code=202)
+async def crawl(source: str):
+    if source not in CRAWL_JOBS:
+        raise HTTPException(status_code=404, detail=f"未知的來源: {source}")
+
+    if not scheduler.trigger(source):
         return {
-            "status": "error",
-            "message": f"爬蟲執行失敗: {str(e)}"
+            "status": "running",
+            "message": f"{source} 爬蟲正在執行中"
         }
+    return {
+        "status": "accepted",
+        "message": f"已開始爬取 {source}"
+    }
 
 # 取得爬蟲狀態
 @app.get("/status")
-async def get_status():
-    return {
-        "status": "running",
-        "last_update": datetime.now().isoformat(),
-        "crawlers": {
-            "netadmin": "active",
-            "newcm": "pending",
-            "mem": "pending"
-        }
-    } 
\ No newline at end of file
+async def get_status(request: Request):
+    return cached_json(request, lambda: {
+        "status": "running" if scheduler.started_at else "stopped",
+        "started_at": scheduler.started_at.isoformat() if scheduler.started_at else None,
+        "timestamp": datetime.now().isoformat(),
+        "crawlers": scheduler.status()
+    })
+
+# 文章與標籤統計（讀取預先彙總的 materialized view）
+@app.get("/stats")
+def read_stats(request: Request, db: Session = Depends(get_db)):
+    return cached_json(request, lambda: get_stats(db))
+
+# 文章列表（含標籤，不含內文）
+@app.get("/articles")
+def read_articles(
+    request: Request,
+    source: str = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    return cached_json(request, lambda: [article_to_dict(article) for article in list_articles(db, source, limit, offset)])
+
+# Prometheus 指標
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,83 @@
+import logging
+import sys
+from collections import defaultdict
+from sqlalchemy import delete, func, select, update
+from article_store import TAG_RESOLVER, clean_tag_name, tag_key
+from database import SessionLocal
+from models import Tag, TagAlias, article_tags
+
+logger = logging.getLogger(__name__)
+
+
+def _merge_into(db, survivor_id, loser_id):
+    """把 loser 的文章關聯與別名移到 survivor，再刪除 loser"""
+    # 文章已有 survivor 標籤時只刪除重複的關聯
+    already_tagged = select(article_tags.c.article_id).where(article_tags.c.tag_id == survivor_id)
+    db.execute(
+        update(article_tags)
+        .where(article_tags.c.tag_id == loser_id, article_tags.c.article_id.not_in(already_tagged))
+        .values(tag_id=survivor_id)
+    )
+    db.execute(delete(article_tags).where(article_tags.c.tag_id == loser_id))
+    db.execute(update(TagAlias).where(TagAlias.tag_id == loser_id).values(tag_id=survivor_id))
+    db.execute(delete(Tag).where(Tag.id == loser_id))
+
+
+def merge_tags(aliases=None, dry_run=False):
+    """合併正規化後相同的標籤（以及手動指定的別名），並為所有標籤建立別名
+
+    aliases: {別名: 標準標籤名稱}，例如 {'k8s': 'Kubernetes'}
+    """
+    db = SessionLocal()
+    try:
+        counts = dict(db.execute(
+            select(article_tags.c.tag_id, func.count()).group_by(article_tags.c.tag_id)
+        ).all())
+        groups = defaultdict(list)
+        for tag_id, name in db.execute(select(Tag.id, Tag.name)).all():
+            groups[tag_key(name)].append((tag_id, name))
+
+        # 手動別名：把別名的群組併入標準標籤的群組
+        for alias, canonical in (aliases or {}).items():
+            alias_key, canonical_key = tag_key(alias), tag_key(canonical)
+            if alias_key == canonical_key:
+                continue
+            if alias_key not in groups or canonical_key not in groups:
+                logger.warning("[MergeTags] 略過別名 %s=%s：%s 沒有對應的標籤", alias, canonical,
+                               alias if alias_key not in groups else canonical)
+                continue
+            groups[canonical_key].extend(groups.pop(alias_key))
+
+        merged = 0
+        for key, tags in groups.items():
+            # 保留名稱就是標準名稱的標籤，其次是文章最多的標籤（相同時保留最早建立的）
+            tags.sort(key=lambda t: (tag_key(t[1]) != key, -counts.get(t[0], 0), t[0]))
+            survivor_id, survivor_name = tags[0]
+            for loser_id, loser_name in tags[1:]:
+                logger.info("[MergeTags] %s -> %s", loser_name, survivor_name)
+                if not dry_run:
+                    _merge_into(db, survivor_id, loser_id)
+                merged += 1
+
+            if not dry_run:
+                if clean_tag_name(survivor_name) != survivor_name:
+                    db.execute(update(Tag).where(Tag.id == survivor_id).values(name=clean_tag_name(survivor_name)))
+                alias_keys = {key} | {tag_key(a) for a, c in (aliases or {}).items() if tag_key(c) == key}
+                for alias_key in alias_keys:
+                    db.merge(TagAlias(alias=alias_key, tag_id=survivor_id))
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+            TAG_RESOLVER.clear()
+        logger.info("[MergeTags] %s 個標籤，合併了 %s 個重複標籤", len(groups), merged,
+                    extra={'count': merged})
+        return merged
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    from cli import main
+    sys.exit(main(['merge-tags'] + sys.argv[1:]))
@@ -0,0 +1,201 @@
+import threading
+import time
+from contextlib import contextmanager
+import aiohttp
+
+# 預設的延遲區間（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """只增不減的計數器"""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name + _format_labels(self.labelnames, key), value
+
+
+class Histogram:
+    """累積分佈的直方圖（Prometheus 格式）"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield (self.name + '_bucket' + _format_labels(self.labelnames, key, ('le', _format_value(bound))),
+                       cumulative)
+            yield self.name + '_sum' + _format_labels(self.labelnames, key), total
+            yield self.name + '_count' + _format_labels(self.labelnames, key), cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def reset(self):
+        for metric in self._metrics:
+            metric.reset()
+
+    def render(self):
+        """輸出 Prometheus text exposition 格式"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, value in metric.samples():
+                lines.append(f"{name} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'crawl_http_requests_total', '爬蟲送出的 HTTP 請求數', ('host', 'status')))
+HTTP_STAGE_SECONDS = REGISTRY.register(Histogram(
+    'crawl_http_stage_seconds', 'HTTP 請求各階段耗時（dns / connect / ttfb / download）', ('host', 'stage')))
+HTTP_RESPONSE_BYTES = REGISTRY.register(Counter(
+    'crawl_http_response_bytes_total', '下載的回應內容大小', ('host',)))
+HTTP_REJECTED = REGISTRY.register(Counter(
+    'crawl_http_rejected_total', '因類型或大小不符而中止讀取的回應數', ('host', 'reason')))
+PARSE_SECONDS = REGISTRY.register(Histogram(
+    'crawl_parse_seconds', '解析單一頁面的耗時', ('source',)))
+DB_WRITE_SECONDS = REGISTRY.register(Histogram(
+    'crawl_db_write_seconds', '寫入單篇文章到資料庫的耗時', ('source',)))
+ARTICLES = REGISTRY.register(Counter(
+    'crawl_articles_total', '處理過的文章數', ('source', 'result')))
+JOB_RUNS = REGISTRY.register(Counter(
+    'crawl_job_runs_total', '排程工作執行次數', ('job', 'status')))
+JOB_SECONDS = REGISTRY.register(Histogram(
+    'crawl_job_duration_seconds', '排程工作執行耗時', ('job',), buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)))
+
+
+@contextmanager
+def timer(histogram, **labels):
+    """量測區塊耗時並記錄到直方圖"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def trace_config():
+    """建立 aiohttp TraceConfig，依主機記錄 DNS / 連線 / TTFB 耗時與回應狀態"""
+    config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.start = time.perf_counter()
+        ctx.host = params.url.host
+
+    async def on_dns_start(session, ctx, params):
+        ctx.dns_start = time.perf_counter()
+
+    async def on_dns_end(session, ctx, params):
+        HTTP_STAGE_SECONDS.observe(time.perf_counter() - ctx.dns_start, host=ctx.host, stage='dns')
+
+    async def on_connection_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def on_connection_end(session, ctx, params):
+        HTTP_STAGE_SECONDS.observe(time.perf_counter() - ctx.connect_start, host=ctx.host, stage='connect')
+
+    async def on_request_end(session, ctx, params):
+        # 收到回應標頭時觸發，從送出請求到此即為 TTFB
+        HTTP_STAGE_SECONDS.observe(time.perf_counter() - ctx.start, host=ctx.host, stage='ttfb')
+        HTTP_REQUESTS.inc(host=ctx.host, status=params.response.status)
+
+    async def on_request_exception(session, ctx, params):
+        HTTP_REQUESTS.inc(host=ctx.host, status='error')
+
+    config.on_request_start.append(on_request_start)
+    config.on_dns_resolvehost_start.append(on_dns_start)
+    config.on_dns_resolvehost_end.append(on_dns_end)
+    config.on_connection_create_start.append(on_connection_start)
+    config.on_connection_create_end.append(on_connection_end)
+    config.on_request_end.append(on_request_end)
+    config.on_request_exception.append(on_request_exception)
+    return config
+
+
+async def serve_metrics(port, host='0.0.0.0'):
+    """在沒有 API 的程序（例如 worker）提供 /metrics，回傳 AppRunner，結束時呼叫 cleanup()"""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(body=REGISTRY.render().encode('utf-8'),
+                            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, int(port)).start()
+    return runner
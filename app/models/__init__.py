@@ -1,3 +1,5 @@
 from .article import Article, Tag, article_tags
+from .crawl_job import CrawlJob
+from .tag_alias import TagAlias
 
-__all__ = ['Article', 'Tag', 'article_tags'] 
\ No newline at end of file
+__all__ = ['Article', 'Tag', 'article_tags', 'CrawlJob', 'TagAlias']
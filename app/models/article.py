@@ -1,13 +1,22 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Table, ForeignKey, func
-from sqlalchemy.orm import relationship
+import hashlib
+from sqlalchemy import Column, Integer, String, Text, DateTime, Table, ForeignKey, Index, func, text
+from sqlalchemy.orm import relationship, deferred, validates
 from database import Base
 
+def content_digest(content):
+    """內文的 SHA-256，用來判斷內容是否變更"""
+    if content is None:
+        return None
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
 # 關聯表
 article_tags = Table(
     'article_tags',
     Base.metadata,
-    Column('article_id', Integer, ForeignKey('articles.id'), primary_key=True),
-    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True)
+    Column('article_id', Integer, ForeignKey('articles.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    # 主鍵 (article_id, tag_id) 只能從文章查標籤，反向查詢需要以 tag_id 開頭的索引
+    Index('ix_article_tags_tag_id', 'tag_id', 'article_id')
 )
 
 class Article(Base):
@@ -18,12 +27,31 @@ class Article(Base):
     url = Column(String(500), unique=True, nullable=False)
     category = Column(String(100))
     summary = Column(Text)
-    content = Column(Text)
+    # 內文只在需要時才載入；資料庫端以 lz4 壓縮（見 alembic 遷移）
+    content = deferred(Column(Text))
+    content_hash = Column(String(64))
+    content_length = Column(Integer)
     source = Column(String(50))
+    # 內文整理（postprocess）完成的時間；NULL 表示還沒整理
+    processed_at = Column(DateTime)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     tags = relationship('Tag', secondary=article_tags, back_populates='articles')
+    
+    __table_args__ = (
+        Index('ix_articles_source_created_at', 'source', 'created_at'),
+        Index('ix_articles_created_at', 'created_at'),
+        Index('ix_articles_updated_at', 'updated_at'),
+        Index('ix_articles_category', 'category'),
+        Index('ix_articles_unprocessed', 'id', postgresql_where=text('processed_at IS NULL')),
+    )
+
+    @validates('content')
+    def _update_content_meta(self, key, content):
+        self.content_hash = content_digest(content)
+        self.content_length = len(content) if content is not None else None
+        return content
 
     def __repr__(self):
         return f"<Article {self.title}>"
@@ -37,5 +65,10 @@ class Tag(Base):
     
     articles = relationship('Article', secondary=article_tags, back_populates='tags')
     
+    # 標籤以 func.lower(Tag.name) 比對，需要運算式索引才用得到
+    __table_args__ = (
+        Index('ix_tags_name_lower', func.lower(name)),
+    )
+    
     def __repr__(self):
         return f"<Tag {self.name}>" 
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func, text
+from database import Base
+
+class CrawlJob(Base):
+    """待爬取的文章 URL（分散式 worker 的工作佇列）"""
+    __tablename__ = 'crawl_jobs'
+    
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), unique=True, nullable=False)
+    source = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default='pending')  # pending / running / done / failed / purged（文章已被保留政策清除）
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100))
+    lease_expires_at = Column(DateTime)
+    available_at = Column(DateTime, nullable=False, default=func.now())
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # 只索引待處理與執行中的工作，讓領取與回收過期租約的查詢保持很小
+        Index('ix_crawl_jobs_pending', 'available_at', 'id', postgresql_where=text("status = 'pending'")),
+        Index('ix_crawl_jobs_running_lease', 'lease_expires_at', postgresql_where=text("status = 'running'")),
+    )
+    
+    def __repr__(self):
+        return f"<CrawlJob {self.status} {self.url}>"
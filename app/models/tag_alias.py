@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy.orm import relationship
+from database import Base
+
+class TagAlias(Base):
+    """標籤正規化後的名稱（或手動設定的別名）對應到的標準標籤"""
+    __tablename__ = 'tag_aliases'
+    
+    alias = Column(String(100), primary_key=True)  # tag_key() 的結果
+    tag_id = Column(Integer, ForeignKey('tags.id', ondelete='CASCADE'), nullable=False, index=True)
+    created_at = Column(DateTime, default=func.now())
+    
+    tag = relationship('Tag')
+    
+    def __repr__(self):
+        return f"<TagAlias {self.alias} -> {self.tag_id}>"
@@ -0,0 +1,148 @@
+import logging
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from sqlalchemy import update
+from database import SessionLocal
+from models import Article
+from models.article import content_digest
+
+logger = logging.getLogger(__name__)
+
+# inline：爬取時直接整理；deferred：先存原始內容，之後由 backfill 批次處理
+POSTPROCESS_MODE = os.getenv('POSTPROCESS_MODE', 'inline')
+
+SUMMARY_LENGTH = 200
+
+# 全形英數字與全形空白轉成半形（中文標點維持全形）
+FULLWIDTH_TABLE = {
+    **{code: code - 0xFEE0 for code in range(ord('０'), ord('９') + 1)},
+    **{code: code - 0xFEE0 for code in range(ord('Ａ'), ord('Ｚ') + 1)},
+    **{code: code - 0xFEE0 for code in range(ord('ａ'), ord('ｚ') + 1)},
+    0x3000: ' ',
+    0x00A0: ' ',
+    0x200B: None,
+    0xFEFF: None,
+}
+
+_HORIZONTAL_SPACE = re.compile(r'[ \t\f\v]+')
+_LINE_BREAKS = re.compile(r'\s*\n\s*')
+_SENTENCE_END = re.compile(r'[。！？!?]')
+
+# 從網址路徑取得分類，例如 /netadmin/zh-tw/news/123 → news
+CATEGORY_PATTERNS = {
+    'netadmin': re.compile(r'/netadmin/zh-tw/([^/]+)/'),
+    '2cm': re.compile(r'/2cm/zh-tw/([^/]+)/'),
+}
+
+
+def clean_text(text):
+    """統一全形字元與空白：每行去掉多餘空白，移除空行"""
+    if not text:
+        return text
+    text = text.translate(FULLWIDTH_TABLE).replace('\r', '')
+    text = _HORIZONTAL_SPACE.sub(' ', text)
+    return _LINE_BREAKS.sub('\n', text).strip()
+
+
+def make_summary(content, length=SUMMARY_LENGTH):
+    """取內文開頭作為摘要，盡量在句尾截斷"""
+    if not content:
+        return None
+    text = content.replace('\n', ' ')
+    if len(text) <= length:
+        return text
+    ends = [m.end() for m in _SENTENCE_END.finditer(text, 0, length)]
+    # 句子太短（不到一半）就直接截斷
+    if ends and ends[-1] >= length // 2:
+        return text[:ends[-1]]
+    return text[:length - 1] + '…'
+
+
+def category_from_url(source, url):
+    pattern = CATEGORY_PATTERNS.get(source)
+    match = pattern.search(url) if pattern and url else None
+    return match.group(1) if match else None
+
+
+def process_article(parsed, source, url):
+    """整理解析結果：清理標題與內文、產生摘要、依網址設定分類"""
+    content = clean_text(parsed['content'])
+    return {
+        **parsed,
+        'title': clean_text(parsed['title']),
+        'content': content,
+        'summary': make_summary(content),
+        'category': category_from_url(source, url) or parsed.get('category'),
+        'processed_at': datetime.now(),
+    }
+
+
+def maybe_process(parsed, source, url):
+    """inline 模式下在解析後直接整理；deferred 模式原樣回傳，留給 backfill"""
+    if not parsed or POSTPROCESS_MODE != 'inline':
+        return parsed
+    return process_article(parsed, source, url)
+
+
+def _process_chunk(rows):
+    """在子程序中整理一批文章，回傳可直接用於 bulk UPDATE 的資料"""
+    results = []
+    for article_id, source, url, title, content, category in rows:
+        content = clean_text(content)
+        results.append({
+            'id': article_id,
+            'title': clean_text(title),
+            'content': content,
+            # bulk UPDATE 不會觸發模型的 validates，需自行計算
+            'content_hash': content_digest(content),
+            'content_length': len(content) if content is not None else None,
+            'summary': make_summary(content),
+            'category': category_from_url(source, url) or category,
+        })
+    return results
+
+
+def backfill(source=None, reprocess=False, workers=None, batch_size=500, chunk_size=100):
+    """批次整理資料庫中尚未處理（或 reprocess=True 時全部）的文章"""
+    db = SessionLocal()
+    count = 0
+    last_id = 0
+    try:
+        # 排程器會在 API 程序的執行緒中呼叫，fork 多執行緒的程序可能複製到被鎖住的鎖，改用 spawn
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            while True:
+                query = db.query(Article.id, Article.source, Article.url, Article.title,
+                                 Article.content, Article.category).filter(Article.id > last_id)
+                # strip 模式清除內文的文章保留原本的摘要，不重新整理
+                query = query.filter(Article.content.is_not(None))
+                if not reprocess:
+                    query = query.filter(Article.processed_at.is_(None))
+                if source:
+                    query = query.filter(Article.source == source)
+                rows = [tuple(row) for row in query.order_by(Article.id).limit(batch_size)]
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+
+                processed_at = datetime.now()
+                chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+                for results in pool.map(_process_chunk, chunks):
+                    for result in results:
+                        result['processed_at'] = processed_at
+                    db.execute(update(Article), results)
+                db.commit()
+                count += len(rows)
+                logger.info("[Postprocess] 已整理 %s 篇文章", count, extra={'count': count})
+    finally:
+        db.close()
+    return count
+
+
+if __name__ == "__main__":
+    from cli import main
+    sys.exit(main(['postprocess'] + sys.argv[1:]))
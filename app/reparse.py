@@ -0,0 +1,75 @@
+import warnings
+from bs4.builder import XMLParsedAsHTMLWarning
+
+# 忽略 BeautifulSoup 的 XML/HTML 警告
+warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
+
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from archive import PageArchive
+from article_store import upsert_article
+from database import SessionLocal
+from postprocess import maybe_process
+from sources import SOURCE_MODULES, load_source
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_chunk(args):
+    """在子程序中讀取封存記錄並解析（CPU 密集的部分）"""
+    root, entries = args
+    archive = PageArchive(root)
+    results = []
+    for entry in entries:
+        try:
+            record = archive.read(entry)
+            parse_article = load_source(entry['source']).parse_article
+            results.append((entry, maybe_process(parse_article(record['html']), entry['source'], entry['url'])))
+        except Exception as e:
+            logger.error("[Reparse] 解析失敗 %s: %s", entry['url'], e, extra={'url': entry['url']})
+            results.append((entry, None))
+    return results
+
+
+def reparse(source=None, root=None, workers=None, chunk_size=50):
+    """把封存的文章頁重新解析並更新資料庫，不需重新爬取"""
+    archive = PageArchive(root)
+    entries = [e for e in archive.latest_entries(source=source) if e['source'] in SOURCE_MODULES]
+    logger.info("[Reparse] 共有 %s 篇封存文章", len(entries), extra={'count': len(entries)})
+
+    chunks = [(archive.root, entries[i:i + chunk_size]) for i in range(0, len(entries), chunk_size)]
+    stats = {'created': 0, 'updated': 0, 'unchanged': 0, 'purged': 0, 'skipped': 0}
+
+    db = SessionLocal()
+    try:
+        # 與 postprocess.backfill 相同，以 spawn 建立子程序，不 fork 可能有其他執行緒持有鎖的程序
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            for results in pool.map(_parse_chunk, chunks):
+                for entry, parsed in results:
+                    if not parsed:
+                        stats['skipped'] += 1
+                        continue
+                    try:
+                        # 以 savepoint 包住單篇文章，失敗時不影響同批其他文章
+                        with db.begin_nested():
+                            stats[upsert_article(db, entry['source'], entry['url'], parsed)] += 1
+                    except Exception as e:
+                        logger.error("[Reparse] 更新文章失敗 %s: %s", entry['url'], e, extra={'url': entry['url']})
+                        stats['skipped'] += 1
+                        continue
+                db.commit()
+                logger.info("[Reparse] 進度: %s", stats)
+    finally:
+        db.close()
+
+    logger.info("[Reparse] 完成: %s", stats)
+    return stats
+
+
+if __name__ == "__main__":
+    from cli import main
+    sys.exit(main(['reparse'] + sys.argv[1:]))
@@ -0,0 +1,196 @@
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import selectinload, undefer
+from archive import PageArchive
+from article_store import article_to_dict
+from database import SessionLocal, get_engine
+from models import Article, CrawlJob, article_tags
+
+logger = logging.getLogger(__name__)
+
+# 保留政策（未設定天數表示不清除）
+RETENTION_DAYS = os.getenv('RETENTION_DAYS')
+# delete：直接刪除；archive：先匯出成 ndjson.gz 再刪除；strip：只清掉內文、保留文章資料
+RETENTION_MODE = os.getenv('RETENTION_MODE', 'delete')
+RETENTION_EXPORT_DIR = os.getenv('RETENTION_EXPORT_DIR', 'exports')
+CRAWL_JOB_RETENTION_DAYS = os.getenv('CRAWL_JOB_RETENTION_DAYS', '30')
+# 已清除文章的網址紀錄保留多久；應大於文章留在列表頁的時間，之後再出現會被當成新文章
+PURGED_JOB_RETENTION_DAYS = os.getenv('PURGED_JOB_RETENTION_DAYS', '365')
+ARCHIVE_RETENTION_DAYS = os.getenv('ARCHIVE_RETENTION_DAYS')
+
+MODES = ('delete', 'archive', 'strip')
+
+
+def _cutoff(days):
+    return datetime.now() - timedelta(days=float(days))
+
+
+def _expired(cutoff, source, after=None):
+    """過期文章的條件；以 created_at（與 source）篩選，可用 ix_articles_(source_)created_at"""
+    query = select(Article.id, Article.created_at, Article.url, Article.source).where(Article.created_at < cutoff)
+    if source:
+        query = query.where(Article.source == source)
+    if after:
+        # keyset 分頁：從上一批的最後一筆之後繼續，不必重新掃過已處理的列
+        query = query.where(tuple_(Article.created_at, Article.id) > after)
+    return query.order_by(Article.created_at, Article.id)
+
+
+def _export_batch(db, ids, f):
+    articles = (
+        db.query(Article)
+        .options(undefer(Article.content), selectinload(Article.tags))
+        .filter(Article.id.in_(ids))
+        .order_by(Article.id)
+    )
+    for article in articles:
+        f.write(json.dumps({**article_to_dict(article), 'content': article.content}, ensure_ascii=False) + '\n')
+
+
+def _mark_purged(db, rows):
+    """在佇列留下 status='purged' 的紀錄：爬蟲、reparse 與 discover 不會再把清除的文章寫回來，
+    expire_crawl_jobs 也不會刪除這些紀錄"""
+    stmt = insert(CrawlJob).values([
+        {'url': row.url, 'source': row.source, 'status': 'purged', 'attempts': 0}
+        for row in rows
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=['url'],
+        set_={'status': 'purged', 'worker_id': None, 'lease_expires_at': None, 'updated_at': func.now()}
+    ))
+
+
+def purge_articles(days, source=None, mode='delete', batch_size=1000, export_dir=None, pause=0.0, dry_run=False):
+    """清除 days 天前建立的文章，每批各自 commit，避免長時間鎖定與過大的交易
+
+    delete / archive 模式會一併刪除 article_tags 的關聯；strip 模式只清除內文。
+    清除的網址都會記錄在佇列（status='purged'），之後仍在列表頁上也不會重新爬取。
+    """
+    if mode not in MODES:
+        raise ValueError(f"未知的模式: {mode}")
+    cutoff = _cutoff(days)
+    db = SessionLocal()
+    export = None
+    count = 0
+    after = None
+    try:
+        if mode == 'archive' and not dry_run:
+            os.makedirs(export_dir or RETENTION_EXPORT_DIR, exist_ok=True)
+            path = os.path.join(export_dir or RETENTION_EXPORT_DIR,
+                                f"articles-{source or 'all'}-{datetime.now():%Y%m%d_%H%M%S}.ndjson.gz")
+            export = gzip.open(path, 'wt', encoding='utf-8')
+            logger.info("[Retention] 匯出到 %s", path)
+
+        while True:
+            query = _expired(cutoff, source, after)
+            if mode == 'strip':
+                query = query.where(Article.content_length.is_not(None))
+            rows = db.execute(query.limit(batch_size)).all()
+            if not rows:
+                break
+            ids = [row.id for row in rows]
+            count += len(ids)
+
+            if dry_run or mode == 'strip':
+                # 這兩種模式的列不會消失，下一批要從這批之後開始
+                after = (rows[-1].created_at, rows[-1].id)
+            if dry_run:
+                continue
+
+            _mark_purged(db, rows)
+            if mode == 'strip':
+                db.execute(
+                    update(Article).where(Article.id.in_(ids))
+                    .values(content=None, content_hash=None, content_length=None)
+                )
+            else:
+                if export:
+                    _export_batch(db, ids, export)
+                # 資料庫有 ON DELETE CASCADE，這裡仍先明確刪除，不依賴各資料庫的外鍵設定
+                db.execute(delete(article_tags).where(article_tags.c.article_id.in_(ids)))
+                db.execute(delete(Article).where(Article.id.in_(ids)))
+            db.commit()
+            logger.info("[Retention] 已處理 %s 篇文章", count, extra={'count': count})
+            if pause:
+                # 讓出時間給其他寫入與 autovacuum
+                time.sleep(pause)
+    finally:
+        if export:
+            export.close()
+        db.close()
+
+    logger.info("[Retention] %s%s %s 天前的文章 %s 篇", '（試算）' if dry_run else '', mode, days, count,
+                extra={'count': count, 'source': source})
+    return count
+
+
+def expire_crawl_jobs(days=None, batch_size=1000, purged_days=None):
+    """刪除已完成或失敗、且超過 days 天沒有更新的佇列工作，以及超過 purged_days 天的已清除文章紀錄
+
+    刪除後同一個網址若再次出現在列表頁會重新排入，保留天數應大於文章留在列表頁的時間。
+    """
+    conditions = []
+    if days is not None:
+        conditions.append(CrawlJob.status.in_(('done', 'failed')) & (CrawlJob.updated_at < _cutoff(days)))
+    if purged_days is not None:
+        conditions.append((CrawlJob.status == 'purged') & (CrawlJob.updated_at < _cutoff(purged_days)))
+    if not conditions:
+        return 0
+    db = SessionLocal()
+    count = 0
+    try:
+        while True:
+            ids = db.scalars(
+                select(CrawlJob.id).where(or_(*conditions)).limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            db.execute(delete(CrawlJob).where(CrawlJob.id.in_(ids)))
+            db.commit()
+            count += len(ids)
+    finally:
+        db.close()
+    logger.info("[Retention] 刪除 %s 筆過期的佇列工作", count, extra={'count': count})
+    return count
+
+
+def expire_archive(days, root=None):
+    """刪除過期的原始網頁封存分段"""
+    removed, freed = PageArchive(root).expire_segments(_cutoff(days))
+    logger.info("[Retention] 刪除 %s 個封存分段，釋放 %.1f MB", removed, freed / 1024 / 1024,
+                extra={'count': removed})
+    return removed
+
+
+def vacuum(tables=('articles', 'article_tags', 'crawl_jobs')):
+    """大量刪除後回收空間並更新統計（VACUUM 不能在交易中執行）"""
+    engine = get_engine()
+    if engine.dialect.name != 'postgresql':
+        return
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for table in tables:
+            conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+    logger.info("[Retention] VACUUM 完成")
+
+
+def apply_retention():
+    """依環境變數設定的保留政策清除資料（排程工作使用）"""
+    if RETENTION_DAYS:
+        purge_articles(RETENTION_DAYS, mode=RETENTION_MODE)
+    if CRAWL_JOB_RETENTION_DAYS or PURGED_JOB_RETENTION_DAYS:
+        expire_crawl_jobs(CRAWL_JOB_RETENTION_DAYS or None, purged_days=PURGED_JOB_RETENTION_DAYS or None)
+    if ARCHIVE_RETENTION_DAYS:
+        expire_archive(ARCHIVE_RETENTION_DAYS)
+    vacuum()
+
+
+if __name__ == "__main__":
+    from cli import main
+    sys.exit(main(['retention'] + sys.argv[1:]))
@@ -0,0 +1,156 @@
+import asyncio
+import contextlib
+import inspect
+import logging
+import os
+from datetime import datetime, timedelta
+from metrics import JOB_RUNS, JOB_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def interval_from_env(name, default_minutes):
+    """讀取 CRAWL_INTERVAL_<NAME> 環境變數（分鐘）"""
+    value = os.getenv(f"CRAWL_INTERVAL_{name.upper()}")
+    return timedelta(minutes=float(value) if value else default_minutes)
+
+
+class Job:
+    """排程工作與最近一次執行狀態"""
+
+    def __init__(self, name, func, interval, kwargs=None, exclusive=True):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.kwargs = kwargs or {}
+        self.exclusive = exclusive
+        self.running = False
+        self.run_count = 0
+        self.last_status = 'pending'
+        self.last_error = None
+        self.last_started = None
+        self.last_finished = None
+        self.last_duration = None
+        self.next_run = None
+
+    def to_dict(self):
+        return {
+            'status': 'running' if self.running else self.last_status,
+            'interval_minutes': self.interval.total_seconds() / 60,
+            'run_count': self.run_count,
+            'last_started': self.last_started.isoformat() if self.last_started else None,
+            'last_finished': self.last_finished.isoformat() if self.last_finished else None,
+            'last_duration': self.last_duration,
+            'last_error': self.last_error,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+        }
+
+
+class Scheduler:
+    """在 FastAPI 程序內定期執行爬蟲
+
+    每個工作在自己的執行緒與事件迴圈中跑，避免同步的資料庫操作卡住 API 的事件迴圈；
+    同一個工作不會重疊執行，爬蟲工作共用 max_concurrent 個執行名額（exclusive=False 的輕量工作不佔名額）。
+    若 uvicorn 開多個 worker，每個 worker 都會有自己的排程器，請只在其中一個啟用。
+    """
+
+    def __init__(self, max_concurrent=1):
+        self.jobs = {}
+        self.max_concurrent = max_concurrent
+        self.started_at = None
+        self._semaphore = None
+        self._tasks = []
+        self._listeners = []
+
+    def add_job(self, name, func, interval, exclusive=True, **kwargs):
+        self.jobs[name] = Job(name, func, interval, kwargs, exclusive)
+        return self.jobs[name]
+
+    def add_listener(self, callback):
+        """註冊工作開始與結束時呼叫的函式 callback(job)"""
+        self._listeners.append(callback)
+
+    def _notify(self, job):
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error("[Scheduler] listener 執行失敗: %s", e)
+
+    async def _execute(self, job):
+        """實際執行一次工作"""
+        if inspect.iscoroutinefunction(job.func):
+            return await asyncio.to_thread(asyncio.run, job.func(**job.kwargs))
+        return await asyncio.to_thread(job.func, **job.kwargs)
+
+    async def _run(self, job):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        try:
+            async with self._semaphore if job.exclusive else contextlib.nullcontext():
+                job.last_started = datetime.now()
+                logger.info("[Scheduler] 開始執行 %s", job.name)
+                self._notify(job)
+                try:
+                    await self._execute(job)
+                    job.last_status = 'success'
+                    job.last_error = None
+                except Exception as e:
+                    job.last_status = 'error'
+                    job.last_error = str(e)
+                    logger.error("[Scheduler] %s 執行失敗: %s", job.name, e)
+                finally:
+                    job.last_finished = datetime.now()
+                    job.last_duration = (job.last_finished - job.last_started).total_seconds()
+                    job.run_count += 1
+                    JOB_RUNS.inc(job=job.name, status=job.last_status)
+                    JOB_SECONDS.observe(job.last_duration, job=job.name)
+                    logger.info("[Scheduler] %s 結束，耗時 %.1f 秒", job.name, job.last_duration)
+        finally:
+            job.running = False
+            self._notify(job)
+
+    async def run_job(self, name):
+        """執行一次指定工作，已在執行中則略過並回傳 False"""
+        job = self.jobs[name]
+        if job.running:
+            logger.info("[Scheduler] %s 仍在執行中，略過這次", name)
+            return False
+        job.running = True
+        await self._run(job)
+        return True
+
+    def trigger(self, name):
+        """手動觸發工作（背景執行），已在執行中則回傳 False"""
+        job = self.jobs[name]
+        if job.running:
+            return False
+        job.running = True
+        self._notify(job)
+        self._tasks = [t for t in self._tasks if not t.done()]
+        self._tasks.append(asyncio.create_task(self._run(job)))
+        return True
+
+    async def _loop(self, job):
+        while True:
+            job.next_run = datetime.now() + job.interval
+            await asyncio.sleep(job.interval.total_seconds())
+            await self.run_job(job.name)
+
+    def start(self):
+        """啟動所有工作的排程迴圈（需在事件迴圈內呼叫）"""
+        self.started_at = datetime.now()
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job)))
+        logger.info("[Scheduler] 已啟動 %s 個排程工作", len(self.jobs))
+
+    async def shutdown(self):
+        """停止排程（執行中的爬蟲執行緒會自行跑完）"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def status(self):
+        return {name: job.to_dict() for name, job in self.jobs.items()}
@@ -5,12 +5,15 @@ from bs4.builder import XMLParsedAsHTMLWarning
 warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
 
 import asyncio
+import logging
 import sys
-import aiohttp
+from log_config import setup_logging
 from scrapers.mem import scrape_mem
 from scrapers.netadmin import scrape_netadmin
 from scrapers.twocm import scrape_2cm
 
+logger = logging.getLogger(__name__)
+
 async def run_all_scrapers():
     """同時執行所有爬蟲"""
     try:
@@ -21,15 +24,17 @@ async def run_all_scrapers():
             asyncio.create_task(scrape_2cm(batch_size=50))
         ]
         
-        print("開始執行所有爬蟲...")
+        logger.info("開始執行所有爬蟲...")
         # 等待所有爬蟲完成
         await asyncio.gather(*tasks)
-        print("所有爬蟲執行完成！")
+        logger.info("所有爬蟲執行完成！")
         
-    except Exception as e:
-        print(f"執行爬蟲時發生錯誤: {str(e)}")
+    except Exception:
+        logger.exception("執行爬蟲時發生錯誤")
 
 if __name__ == "__main__":
+    setup_logging()
+    
     # 在 Windows 上需要使用 SelectEventLoop
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
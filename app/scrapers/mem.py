@@ -1,105 +1,154 @@
 from datetime import datetime
-from models.article import Article, Tag
+from article_store import is_purged, resolve_tags
+from models.article import Article
 from database import SessionLocal
 import aiohttp
 from bs4 import BeautifulSoup
 from urllib.parse import unquote
-import traceback
+import logging
+from extract import make_soup, strainer
+from fetch import PageRejected, connector, read_page
+from postprocess import maybe_process
+from metrics import ARTICLES, DB_WRITE_SECONDS, PARSE_SECONDS, timer, trace_config
+
+logger = logging.getLogger(__name__)
+
+SOURCE = "MEM"
+HOME_URL = "https://www.mem.com.tw/"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 文章頁只需要標題、內文與標籤
+ARTICLE_STRAINER = strainer('mem-post-single-title', 'mem-post-single-content', 'mem-post-single-tags')
+
+def parse_article(html, mode=None):
+    """解析文章頁面"""
+    article_soup = make_soup(html, ARTICLE_STRAINER, mode)
+    
+    # 取得文章資訊
+    title = article_soup.select_one('.mem-post-single-title')
+    title = title.text.strip() if title else ""
+    
+    content = article_soup.select_one('.mem-post-single-content')
+    content = content.text.strip() if content else ""
+    
+    # 只處理有標題和內容的文章
+    if not (title and content):
+        return None
+    
+    tags = article_soup.select('.mem-post-single-tags ul li a')
+    return {
+        'title': title,
+        'content': content,
+        # 取得摘要 (使用內容的前200字)
+        'summary': content[:200],
+        'category': "news",
+        'tags': [tag_elem.text.strip() for tag_elem in tags]
+    }
+
+async def get_article_links(session):
+    """從首頁取得文章連結"""
+    article_links = set()
+    
+    # 爬取首頁
+    async with session.get(HOME_URL) as response:
+        if response.status == 200:
+            html = await read_page(response, HOME_URL, SOURCE, kind='listing')
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            # 找出所有文章連結
+            for link in soup.find_all('a', href=True):
+                href = link['href']
+                if (href.startswith(HOME_URL) and 
+                    not any(x in href for x in ['category', 'magazine', 'seminar', 'vendor', 'video', 'whitepaper'])):
+                    article_links.add(href)
+            
+            logger.info("[MEM] 首頁找到 %s 篇文章", len(article_links), extra={'count': len(article_links)})
+    
+    return article_links
+
+async def get_article_content(session, url):
+    """取得文章內容"""
+    try:
+        async with session.get(url) as article_response:
+            if article_response.status != 200:
+                return None
+                
+            article_html = await read_page(article_response, url, SOURCE)
+            with timer(PARSE_SECONDS, source=SOURCE):
+                return maybe_process(parse_article(article_html), SOURCE, url)
+            
+    except PageRejected as e:
+        logger.warning("[MEM] 略過文章 %s", e, extra={'url': url})
+    except Exception as e:
+        logger.error("[MEM] 取得文章內容時發生錯誤 %s: %s", url, e, extra={'url': url})
+    return None
 
 async def scrape_mem(batch_size=50):
     """爬取 mem 網站文章"""
-    print("[MEM] 開始爬取...")
+    logger.info("[MEM] 開始爬取...")
     
     timeout = aiohttp.ClientTimeout(total=60)
-    connector = aiohttp.TCPConnector(limit=10, force_close=True)
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
     
-    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+    async with aiohttp.ClientSession(connector=connector(force_close=True), timeout=timeout, headers=HEADERS,
+                                     trace_configs=[trace_config()]) as session:
         db = SessionLocal()
         try:
-            article_links = set()
-            
-            # 爬取首頁
-            async with session.get("https://www.mem.com.tw/") as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # 找出所有文章連結
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
-                        if (href.startswith('https://www.mem.com.tw/') and 
-                            not any(x in href for x in ['category', 'magazine', 'seminar', 'vendor', 'video', 'whitepaper'])):
-                            article_links.add(href)
-                    
-                    print(f"\n[MEM] 首頁找到 {len(article_links)} 篇文章")
+            article_links = await get_article_links(session)
             
             # 爬取每篇文章內容
             for url in article_links:
                 try:
-                    print(f"\n[MEM] 正在爬取文章: {unquote(url)}")
+                    logger.debug("[MEM] 正在爬取文章: %s", unquote(url))
                     
                     # 檢查文章是否已存在
-                    existing_article = db.query(Article).filter(Article.url == url).first()
+                    existing_article = db.query(Article.id).filter(Article.url == url).first()
                     if existing_article:
-                        print(f"[MEM] 文章已存在: {url}")
+                        logger.debug("[MEM] 文章已存在: %s", url)
+                        ARTICLES.inc(source=SOURCE, result='exists')
+                        continue
+
+                    # 已被保留政策清除的文章不再抓取
+                    if is_purged(db, url):
+                        logger.debug("[MEM] 文章已清除: %s", url)
+                        ARTICLES.inc(source=SOURCE, result='purged')
                         continue
                     
-                    async with session.get(url) as article_response:
-                        if article_response.status != 200:
-                            continue
-                            
-                        article_html = await article_response.text()
-                        article_soup = BeautifulSoup(article_html, 'html.parser')
-                        
-                        # 取得文章資訊
-                        title = article_soup.select_one('.mem-post-single-title')
-                        title = title.text.strip() if title else ""
+                    parsed = await get_article_content(session, url)
+                    
+                    if not parsed:
+                        continue
+                    
+                    with timer(DB_WRITE_SECONDS, source=SOURCE):
+                        # 取得標準標籤（不存在時建立）
+                        tags = resolve_tags(db, parsed['tags'])
                         
-                        content = article_soup.select_one('.mem-post-single-content')
-                        content = content.text.strip() if content else ""
+                        # 建立文章
+                        article = Article(
+                            title=parsed['title'],
+                            url=url,
+                            summary=parsed['summary'],
+                            content=parsed['content'],
+                            source=SOURCE,
+                            category=parsed['category'],
+                            processed_at=parsed.get('processed_at'),
+                            tags=tags
+                        )
+                        db.add(article)
                         
-                        # 取得摘要 (使用內容的前200字)
-                        summary = content[:200] if content else ""
+                        db.commit()
+                        ARTICLES.inc(source=SOURCE, result='created')
+                        logger.debug("[MEM] 成功儲存文章: %s", parsed['title'])
                         
-                        # 只處理有標題和內容的文章
-                        if title and content:
-                            # 建立文章
-                            article = Article(
-                                title=title,
-                                url=url,
-                                summary=summary,
-                                content=content,
-                                source="MEM",
-                                category="news"
-                            )
-                            db.add(article)
-                            
-                            # 處理標籤
-                            tags = article_soup.select('.mem-post-single-tags ul li a')
-                            if tags:
-                                for tag_elem in tags:
-                                    tag_name = tag_elem.text.strip()
-                                    # 檢查標籤是否已存在
-                                    tag = db.query(Tag).filter(Tag.name == tag_name).first()
-                                    if not tag:
-                                        tag = Tag(name=tag_name)
-                                        db.add(tag)
-                                        db.flush()
-                                    article.tags.append(tag)
-                            
-                            db.commit()
-                            print(f"[MEM] 成功儲存文章: {title}")
-                            
                 except Exception as e:
-                    print(f"[MEM] 處理文章時發生錯誤 {url}: {str(e)}")
+                    logger.error("[MEM] 處理文章時發生錯誤 %s: %s", url, e, extra={'url': url})
+                    ARTICLES.inc(source=SOURCE, result='failed')
                     db.rollback()
                     continue
                     
-        except Exception as e:
-            print(f"[MEM] 發生錯誤: {str(e)}")
+        except Exception:
+            logger.exception("[MEM] 發生錯誤")
             db.rollback()
         finally:
-            db.close() 
\ No newline at end of file
+            db.close()
@@ -3,14 +3,29 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import logging
 import re
-from models import Article, Tag
+from article_store import is_purged, resolve_tags
+from models import Article
 from database import get_db, SessionLocal
-from sqlalchemy import func
-import traceback
 from typing import List
 from sqlalchemy.orm import Session
 import asyncio
 from aiohttp import ClientTimeout
+from extract import make_soup, strainer
+from fetch import PageRejected, connector, read_page
+from postprocess import maybe_process
+from metrics import ARTICLES, DB_WRITE_SECONDS, PARSE_SECONDS, timer, trace_config
+
+logger = logging.getLogger(__name__)
+
+SOURCE = 'netadmin'
+BASE_URL = "https://www.netadmin.com.tw"
+# 文章頁只需要標題、內文與標籤
+ARTICLE_STRAINER = strainer('pageTitle', 'pageContent', 'pageTagBox')
+CATEGORIES = [
+    f"{BASE_URL}/netadmin/zh-tw/feature/",
+    f"{BASE_URL}/netadmin/zh-tw/news/",
+    f"{BASE_URL}/netadmin/zh-tw/technology/"
+]
 
 def clean_url(url):
     """清理 URL"""
@@ -18,41 +33,44 @@ def clean_url(url):
         return url.replace('/netadmin/zh-tw/netadmin/zh-tw/', '/netadmin/zh-tw/')
     return url
 
+def parse_article(html, mode=None):
+	"""解析文章頁面"""
+	soup = make_soup(html, ARTICLE_STRAINER, mode)
+	
+	# 修正選擇器以匹配實際網頁結構
+	title = soup.select_one('.pageTitle h1')  # 文章標題
+	content = soup.select_one('.pageContent')  # 文章內容
+	tags = soup.select('.pageTagBox .pageTag')  # 修正為正確的標籤選擇器
+	
+	if title and content:
+		tag_list = []
+		if tags:
+			# 直接取得 span 的文字內容
+			tag_list = [tag.text.strip() for tag in tags if tag.text.strip()]
+			logger.debug("[NetAdmin] 找到標籤: %s", tag_list)
+		else:
+			logger.warning("[NetAdmin] 警告：沒有找到標籤 %s", title.text.strip())
+		
+		return {
+			'title': title.text.strip(),
+			'content': content.text.strip(),
+			'tags': tag_list
+		}
+	return None
+
 async def get_article_content(session, url):
 	"""取得文章內容"""
 	try:
 		async with session.get(url, timeout=30) as response:
 			if response.status == 200:
-				html = await response.text()
-				soup = BeautifulSoup(html, 'html.parser')
-				
-				# 修正選擇器以匹配實際網頁結構
-				title = soup.select_one('.pageTitle h1')  # 文章標題
-				content = soup.select_one('.pageContent')  # 文章內容
-				tags = soup.select('.pageTagBox .pageTag')  # 修正為正確的標籤選擇器
+				html = await read_page(response, url, SOURCE)
+				with timer(PARSE_SECONDS, source=SOURCE):
+					return maybe_process(parse_article(html), SOURCE, clean_url(url))
 				
-				if title and content:
-					tag_list = []
-					if tags:
-						# 直接取得 span 的文字內容
-						tag_list = [tag.text.strip() for tag in tags if tag.text.strip()]
-						print(f"[NetAdmin] 找到標籤: {tag_list}")
-					else:
-						print(f"[NetAdmin] 警告：沒有找到標籤")
-						
-						# 輸出頁面結構以供檢查
-						print("[NetAdmin] 頁面結構預覽:")
-						print(soup.prettify()[:1000])
-					
-					return {
-						'title': title.text.strip(),
-						'content': content.text.strip(),
-						'tags': tag_list
-					}
-					
-	except Exception as e:
-		print(f"[NetAdmin] 取得文章內容時發生錯誤 {url}: {str(e)}")
-		traceback.print_exc()
+	except PageRejected as e:
+		logger.warning("[NetAdmin] 略過文章 %s", e, extra={'url': url})
+	except Exception:
+		logger.exception("[NetAdmin] 取得文章內容時發生錯誤 %s", url, extra={'url': url})
 	return None
 
 async def get_article_links(session, base_url, max_pages=100):
@@ -63,18 +81,18 @@ async def get_article_links(session, base_url, max_pages=100):
 	while page <= max_pages:  # 限制最多抓取10頁
 		url = f"{base_url}?page={page}"
 		try:
-			print(f"\n[NetAdmin] 正在請求頁面 {page}/{max_pages}: {url}")
+			logger.debug("[NetAdmin] 正在請求頁面 %s/%s: %s", page, max_pages, url)
 			async with session.get(url, timeout=30) as response:
 				if response.status == 200:
-					html = await response.text()
+					html = await read_page(response, url, SOURCE, kind='listing')
 					soup = BeautifulSoup(html, 'html.parser')
 					
 					articles = soup.select('li.thumbnail.pageList')
 					if not articles:  # 如果沒有找到文章，表示已經到最後一頁
-						print(f"[NetAdmin] 頁面 {page} 沒有找到文章，結束抓取")
+						logger.info("[NetAdmin] 頁面 %s 沒有找到文章，結束抓取", page)
 						break
 						
-					print(f"[NetAdmin] 在頁面 {page} 找到 {len(articles)} 篇文章")
+					logger.debug("[NetAdmin] 在頁面 %s 找到 %s 篇文章", page, len(articles))
 					
 					for article in articles:
 						try:
@@ -86,13 +104,12 @@ async def get_article_links(session, base_url, max_pages=100):
 								link = link_elem.get('href')
 								if link:
 									if not link.startswith('http'):
-										link = f"https://www.netadmin.com.tw{link}"
+										link = f"{BASE_URL}{link}"
 										
 									title = title_elem.text.strip()
 									date = date_elem.text.strip() if date_elem else None
 									
-									print(f"[NetAdmin] 文章: {title}")
-									print(f"[NetAdmin] 連結: {link}")
+									logger.debug("[NetAdmin] 文章: %s 連結: %s", title, link)
 									
 									all_links.append({
 										'url': clean_url(link),
@@ -100,31 +117,38 @@ async def get_article_links(session, base_url, max_pages=100):
 										'date': date
 									})
 						except Exception as e:
-							print(f"[NetAdmin] 處理文章連結時發生錯誤: {str(e)}")
+							logger.warning("[NetAdmin] 處理文章連結時發生錯誤: %s", e)
 							continue
 							
 					page += 1  # 繼續下一頁
 				else:
-					print(f"[NetAdmin] 頁面 {page} 請求失敗: {response.status}")
+					logger.warning("[NetAdmin] 頁面 %s 請求失敗: %s", page, response.status, extra={'url': url})
 					break
 					
-		except Exception as e:
-			print(f"[NetAdmin] 取得文章列表時發生錯誤: {str(e)}")
-			traceback.print_exc()
+		except Exception:
+			logger.exception("[NetAdmin] 取得文章列表時發生錯誤", extra={'url': url})
 			break
 			
-	print(f"[NetAdmin] 總共找到 {len(all_links)} 篇文章")
+	logger.info("[NetAdmin] 總共找到 %s 篇文章", len(all_links), extra={'url': base_url})
 	return all_links
 
-async def save_article(db: Session, url: str, title: str, content: str, tags: List[str]):
+async def save_article(db: Session, url: str, title: str, content: str, tags: List[str],
+                       summary: str = None, category: str = None, processed_at: datetime = None):
     """儲存文章到資料庫"""
     try:
         url = clean_url(url)
         
         # 檢查文章是否已存在
-        existing = db.query(Article).filter(Article.url == url).first()
+        existing = db.query(Article.id).filter(Article.url == url).first()
         if existing:
-            print(f"[NetAdmin] 文章已存在: {title}")
+            logger.debug("[NetAdmin] 文章已存在: %s", title)
+            ARTICLES.inc(source=SOURCE, result='exists')
+            return
+
+        # 已被保留政策清除的文章不再重新建立
+        if is_purged(db, url):
+            logger.debug("[NetAdmin] 文章已清除: %s", title)
+            ARTICLES.inc(source=SOURCE, result='purged')
             return
             
         # 建立新文章
@@ -132,58 +156,39 @@ async def save_article(db: Session, url: str, title: str, content: str, tags: Li
             url=url,
             title=title,
             content=content,
-            source='netadmin',
+            summary=summary,
+            category=category,
+            processed_at=processed_at,
+            source=SOURCE,
             created_at=datetime.now()
         )
         
-        # 處理標籤
-        if tags:
-            print(f"[NetAdmin] 正在處理 {len(tags)} 個標籤")
-            for tag_name in tags:
-                try:
-                    # 檢查標籤是否已存在
-                    tag = db.query(Tag).filter(func.lower(Tag.name) == func.lower(tag_name)).first()
-                    if not tag:
-                        print(f"[NetAdmin] 建立新標籤: {tag_name}")
-                        tag = Tag(name=tag_name)
-                        db.add(tag)
-                    article.tags.append(tag)
-                except Exception as e:
-                    print(f"[NetAdmin] 處理標籤 {tag_name} 時發生錯誤: {str(e)}")
-                    continue
-        else:
-            print(f"[NetAdmin] 警告：文章沒有標籤")
+        # 處理標籤（對應到標準標籤，不存在時建立）
+        article.tags = resolve_tags(db, tags)
             
         db.add(article)
         db.commit()
-        print(f"[NetAdmin] 已儲存文章: {title}")
-        if article.tags:
-            print(f"[NetAdmin] 已儲存標籤: {[tag.name for tag in article.tags]}")
+        ARTICLES.inc(source=SOURCE, result='created')
+        logger.debug("[NetAdmin] 已儲存文章: %s 標籤: %s", title, tags)
         
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"[NetAdmin] 儲存文章時發生錯誤: {str(e)}")
-        traceback.print_exc()
+        ARTICLES.inc(source=SOURCE, result='failed')
+        logger.exception("[NetAdmin] 儲存文章時發生錯誤", extra={'url': url})
 
 async def scrape_netadmin(batch_size: int = 50):
     """主要爬蟲函數"""
-    print("[NetAdmin] 開始爬取...")
-    
-    categories = [
-        "https://www.netadmin.com.tw/netadmin/zh-tw/feature/",
-        "https://www.netadmin.com.tw/netadmin/zh-tw/news/",
-        "https://www.netadmin.com.tw/netadmin/zh-tw/technology/"
-    ]
+    logger.info("[NetAdmin] 開始爬取...")
     
     timeout = ClientTimeout(total=60)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        for category_url in categories:
+    async with aiohttp.ClientSession(connector=connector(), timeout=timeout, trace_configs=[trace_config()]) as session:
+        for category_url in CATEGORIES:
             try:
-                print(f"\n[NetAdmin] 處理分類: {category_url}")
+                logger.info("[NetAdmin] 處理分類: %s", category_url)
                 
                 # 取得文章列表
                 articles = await get_article_links(session, category_url)
-                print(f"[NetAdmin] 找到 {len(articles)} 篇文章")
+                logger.info("[NetAdmin] 找到 %s 篇文章", len(articles), extra={'count': len(articles)})
                 
                 # 批次處理文章
                 for i in range(0, len(articles), batch_size):
@@ -202,23 +207,27 @@ async def scrape_netadmin(batch_size: int = 50):
                             content = await task
                             if content:
                                 db = SessionLocal()
-                                await save_article(
-                                    db,
-                                    article['url'],
-                                    content['title'],
-                                    content['content'],
-                                    content['tags']
-                                )
+                                with timer(DB_WRITE_SECONDS, source=SOURCE):
+                                    await save_article(
+                                        db,
+                                        article['url'],
+                                        content['title'],
+                                        content['content'],
+                                        content['tags'],
+                                        content.get('summary'),
+                                        content.get('category'),
+                                        content.get('processed_at')
+                                    )
                                 db.close()
                         except Exception as e:
-                            print(f"[NetAdmin] 處理文章時發生錯誤: {str(e)}")
+                            logger.error("[NetAdmin] 處理文章時發生錯誤: %s", e, extra={'url': article['url']})
                             continue
                             
             except Exception as e:
-                print(f"[NetAdmin] 處理分類時發生錯誤: {str(e)}")
+                logger.error("[NetAdmin] 處理分類時發生錯誤: %s", e, extra={'url': category_url})
                 continue
                 
-    print("[NetAdmin] 爬取完成")
+    logger.info("[NetAdmin] 爬取完成")
 
 if __name__ == "__main__":
     asyncio.run(scrape_netadmin()) 
\ No newline at end of file
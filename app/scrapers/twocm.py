@@ -1,85 +1,86 @@
 import aiohttp
-from bs4 import BeautifulSoup
-import traceback
+import logging
 from database import SessionLocal
-from models import Article, Tag
+from article_store import upsert_article
 import xml.etree.ElementTree as ET
+from extract import make_soup, strainer
+from fetch import HEADERS, PageRejected, connector, read_page
+from postprocess import maybe_process
+from metrics import ARTICLES, DB_WRITE_SECONDS, PARSE_SECONDS, timer, trace_config
+
+logger = logging.getLogger(__name__)
+
+SOURCE = '2cm'
+RSS_URL = "https://www.2cm.com.tw/2cm/Rss.aspx"
 
 async def get_article_links(session, url):
     """從 RSS 取得文章連結列表"""
     links = []
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'zh-TW,zh;q=0.9,en;q=0.8'
-        }
-        
-        rss_url = "https://www.2cm.com.tw/2cm/Rss.aspx"
-        
-        async with session.get(rss_url, headers=headers, timeout=10) as response:
+        async with session.get(RSS_URL, headers=HEADERS, timeout=10) as response:
             if response.status == 200:
-                xml_content = await response.text()
+                xml_content = await read_page(response, RSS_URL, SOURCE, kind='rss')
                 root = ET.fromstring(xml_content)
                 
                 # RSS 文章都在 item 標籤裡
                 items = root.findall('.//item')
-                print(f"[2CM] 從 RSS 找到 {len(items)} 篇文章")
+                logger.info("[2CM] 從 RSS 找到 %s 篇文章", len(items), extra={'count': len(items)})
                 
                 for item in items:
                     link = item.find('link')
                     if link is not None and link.text:
                         links.append(link.text)
-                        print(f"[2CM] 找到文章連結: {link.text}")
+                        logger.debug("[2CM] 找到文章連結: %s", link.text)
                         
-    except Exception as e:
-        print(f"[2CM] 取得 RSS 文章列表時發生錯誤: {str(e)}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("[2CM] 取得 RSS 文章列表時發生錯誤")
         
     return links
 
+# 標籤要以 div.col-sm-9 限定（側欄也有 pageTagBox），所以保留整個主欄
+ARTICLE_STRAINER = strainer('col-sm-9', 'pageTitle', 'pageContent')
+
+def parse_article(html, mode=None):
+    """解析文章頁面"""
+    soup = make_soup(html, ARTICLE_STRAINER, mode)
+    
+    title = soup.select_one('.pageTitle h1')
+    content = soup.select_one('.pageContent')
+    
+    # 使用更精確的選擇器找標籤
+    tag_box = soup.select_one('div.col-sm-9 div.pageTagBox')
+    tag_list = []
+    
+    if tag_box:
+        tags = tag_box.find_all('span', {'class': 'pageTag', 'onclick': True})
+        if tags:
+            for tag in tags:
+                tag_text = tag.get_text(strip=True)
+                if tag_text:
+                    tag_list.append(tag_text)
+            logger.debug("[2CM] 找到 %s 個標籤: %s", len(tags), tag_list)
+    
+    if title and content:
+        return {
+            'title': title.text.strip(),
+            'content': content.text.strip(),
+            'tags': tag_list
+        }
+    return None
+
 async def get_article_content(session, url):
     """取得文章內容"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'zh-TW,zh;q=0.9,en;q=0.8'
-        }
-        
-        async with session.get(url, headers=headers, timeout=10) as response:
+        async with session.get(url, headers=HEADERS, timeout=10) as response:
             if response.status == 200:
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                title = soup.select_one('.pageTitle h1')
-                content = soup.select_one('.pageContent')
-                
-                # 使用更精確的選擇器找標籤
-                tag_box = soup.select_one('div.col-sm-9 div.pageTagBox')
-                tag_list = []
-                
-                if tag_box:
-                    tags = tag_box.find_all('span', {'class': 'pageTag', 'onclick': True})
-                    if tags:
-                        print(f"\n[2CM] 找到 {len(tags)} 個標籤")
-                        for tag in tags:
-                            tag_text = tag.get_text(strip=True)
-                            if tag_text:
-                                tag_list.append(tag_text)
-                                print(f"[2CM] 標籤: {tag_text}")
-                
-                if title and content:
-                    result = {
-                        'title': title.text.strip(),
-                        'content': content.text.strip(),
-                        'tags': tag_list
-                    }
-                    return result
+                html = await read_page(response, url, SOURCE)
+                with timer(PARSE_SECONDS, source=SOURCE):
+                    return maybe_process(parse_article(html), SOURCE, url)
                     
-    except Exception as e:
-        print(f"[2CM] 取得文章內容時發生錯誤 {url}: {str(e)}")
-        traceback.print_exc()
+    except PageRejected as e:
+        logger.warning("[2CM] 略過文章 %s", e, extra={'url': url})
+    except Exception:
+        logger.exception("[2CM] 取得文章內容時發生錯誤 %s", url, extra={'url': url})
     return None
 
 async def get_article_links_stream(session, max_depth=10):
@@ -91,10 +92,10 @@ async def get_article_links_stream(session, max_depth=10):
 
 async def scrape_2cm(batch_size=50):
     """爬取2CM文章"""
-    print("開始爬取 2CM...")
+    logger.info("[2CM] 開始爬取...")
     
     try:
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(connector=connector(), trace_configs=[trace_config()]) as session:
             db = SessionLocal()
             current_batch = []
             
@@ -103,81 +104,40 @@ async def scrape_2cm(batch_size=50):
                 links = await get_article_links(session, "https://www.2cm.com.tw/2cm/zh-tw/tech")
                 
                 if not links:
-                    print("[2CM] 沒有找到文章連結")
+                    logger.warning("[2CM] 沒有找到文章連結")
                     return
                 
-                print(f"[2CM] 找到 {len(links)} 篇文章")
+                logger.info("[2CM] 找到 %s 篇文章", len(links), extra={'count': len(links)})
                 
                 for url in links:
                     content = await get_article_content(session, url)
-                    if content:
-                        existing_article = db.query(Article).filter(Article.url == url).first()
-                        
-                        if existing_article:
-                            print(f"\n[2CM] 更新文章: {content['title']}")
-                            existing_article.title = content['title']
-                            existing_article.content = content['content']
-                            
-                            # 清除現有標籤關聯
-                            existing_article.tags = []
-                            db.flush()
-                            
-                            # 處理標籤
-                            for tag_name in content['tags']:
-                                tag = db.query(Tag).filter(Tag.name == tag_name).first()
-                                if not tag:
-                                    tag = Tag(name=tag_name)
-                                    db.add(tag)
-                                    db.flush()
-                                existing_article.tags.append(tag)
-                                db.flush()
-                            
-                            current_batch.append(existing_article)
-                        else:
-                            print(f"\n[2CM] 新增文章: {content['title']}")
-                            article = Article(
-                                title=content['title'],
-                                content=content['content'],
-                                url=url,
-                                source='2cm'
-                            )
-                            db.add(article)
-                            db.flush()
-                            
-                            # 處理標籤
-                            for tag_name in content['tags']:
-                                tag = db.query(Tag).filter(Tag.name == tag_name).first()
-                                if not tag:
-                                    tag = Tag(name=tag_name)
-                                    db.add(tag)
-                                    db.flush()
-                                article.tags.append(tag)
-                                db.flush()
-                            
-                            current_batch.append(article)
-                        
-                        print(f"[2CM] 標籤: {', '.join(content['tags'])}")
+                    if not content:
+                        continue
+                    
+                    with timer(DB_WRITE_SECONDS, source=SOURCE):
+                        # 內文沒有變更時只更新標籤、摘要與分類
+                        result = upsert_article(db, SOURCE, url, content)
+                        logger.debug("[2CM] 儲存文章（%s）: %s", result, content['title'])
+                        ARTICLES.inc(source=SOURCE, result=result)
+                        if result in ('created', 'updated'):
+                            current_batch.append(url)
                         
                         # 當達到批次大小時，提交到資料庫
                         if len(current_batch) >= batch_size:
-                            print(f"\n[2CM] 寫入 {len(current_batch)} 篇文章到資料庫...")
                             db.commit()
+                            logger.info("[2CM] 寫入 %s 篇文章到資料庫", len(current_batch), extra={'count': len(current_batch)})
                             current_batch = []
-                            print("[2CM] 寫入完成！")
                 
                 # 處理最後一批
                 if current_batch:
-                    print(f"\n[2CM] 寫入最後 {len(current_batch)} 篇文章到資料庫...")
                     db.commit()
-                    print("[2CM] 寫入完成！")
+                    logger.info("[2CM] 寫入最後 %s 篇文章到資料庫", len(current_batch), extra={'count': len(current_batch)})
                     
-            except Exception as e:
-                print(f"[2CM] 處理文章時發生錯誤: {str(e)}")
-                traceback.print_exc()
+            except Exception:
+                logger.exception("[2CM] 處理文章時發生錯誤")
                 db.rollback()
                 
-    except Exception as e:
-        print(f"[2CM] 爬取過程發生錯誤: {str(e)}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("[2CM] 爬取過程發生錯誤")
     finally:
         db.close()
\ No newline at end of file
@@ -0,0 +1,14 @@
+import importlib
+
+# 各來源（Article.source 的值）對應的爬蟲模組
+# 每個模組提供 parse_article(html)、get_article_content(session, url) 與文章連結的取得函式
+SOURCE_MODULES = {
+    'netadmin': 'scrapers.netadmin',
+    '2cm': 'scrapers.twocm',
+    'MEM': 'scrapers.mem',
+}
+
+
+def load_source(source):
+    """載入來源對應的爬蟲模組"""
+    return importlib.import_module(SOURCE_MODULES[source])
@@ -0,0 +1,110 @@
+import logging
+from sqlalchemy import Column, BigInteger, DateTime, Integer, MetaData, String, Table, func, select, text
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 統計用的 materialized view（由 alembic 建立，不放進 Base.metadata 以免 create_all 建成一般資料表）
+stats_metadata = MetaData()
+
+article_category_stats = Table(
+    'article_category_stats',
+    stats_metadata,
+    Column('source', String(50)),
+    Column('category', String(100)),
+    Column('article_count', BigInteger),
+    Column('with_content_count', BigInteger),
+    Column('latest_created_at', DateTime),
+    Column('refreshed_at', DateTime),
+)
+
+tag_stats = Table(
+    'tag_stats',
+    stats_metadata,
+    Column('tag_id', Integer),
+    Column('name', String(100)),
+    Column('article_count', BigInteger),
+)
+
+STATS_VIEWS = ('article_category_stats', 'tag_stats')
+
+# 目前（最新 migration 之後）的 view 定義，給不經過 alembic 重建資料庫的 clear_db 使用
+STATS_VIEW_DDL = (
+    """
+    CREATE MATERIALIZED VIEW article_category_stats AS
+    SELECT coalesce(source, '') AS source,
+           coalesce(category, '') AS category,
+           count(*) AS article_count,
+           count(*) FILTER (WHERE content_length > 0) AS with_content_count,
+           max(created_at) AS latest_created_at,
+           now()::timestamp AS refreshed_at
+    FROM articles
+    GROUP BY 1, 2
+    """,
+    "CREATE UNIQUE INDEX ux_article_category_stats ON article_category_stats (source, category)",
+    """
+    CREATE MATERIALIZED VIEW tag_stats AS
+    SELECT t.id AS tag_id,
+           t.name,
+           count(at.article_id) AS article_count
+    FROM tags t
+    LEFT JOIN article_tags at ON at.tag_id = t.id
+    GROUP BY t.id, t.name
+    """,
+    "CREATE UNIQUE INDEX ux_tag_stats_tag_id ON tag_stats (tag_id)",
+    "CREATE INDEX ix_tag_stats_article_count ON tag_stats (article_count DESC, name)",
+)
+
+
+def drop_stats_views(conn):
+    """刪除統計 view；view 依賴 articles / tags，刪除資料表前要先刪除"""
+    for view in reversed(STATS_VIEWS):
+        conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {view}"))
+
+
+def create_stats_views(conn):
+    """建立統計 view（CREATE MATERIALIZED VIEW ... AS 會同時計算一次內容）"""
+    for ddl in STATS_VIEW_DDL:
+        conn.execute(text(ddl))
+
+
+def refresh_stats(concurrently=True):
+    """重新計算統計；CONCURRENTLY 更新期間讀取不會被擋住"""
+    db = SessionLocal()
+    try:
+        for view in STATS_VIEWS:
+            db.execute(text(f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY ' if concurrently else ''}{view}"))
+        db.commit()
+        logger.info("[Stats] 統計已更新")
+    finally:
+        db.close()
+
+
+def get_stats(db, top_tags=10):
+    """讀取預先彙總的統計（只查 materialized view，不掃描文章表）"""
+    rows = db.execute(select(article_category_stats)).mappings().all()
+    total_tags = db.execute(select(func.count()).select_from(tag_stats)).scalar()
+    top = db.execute(
+        select(tag_stats.c.name, tag_stats.c.article_count)
+        .where(tag_stats.c.article_count > 0)
+        .order_by(tag_stats.c.article_count.desc(), tag_stats.c.name)
+        .limit(top_tags)
+    ).all()
+
+    sources = {}
+    categories = {}
+    for row in rows:
+        sources[row['source']] = sources.get(row['source'], 0) + row['article_count']
+        categories[row['category']] = categories.get(row['category'], 0) + row['article_count']
+
+    refreshed = [row['refreshed_at'] for row in rows if row['refreshed_at']]
+    return {
+        'total_articles': sum(row['article_count'] for row in rows),
+        'articles_with_content': sum(row['with_content_count'] for row in rows),
+        'total_tags': total_tags,
+        'sources': sources,
+        'categories': categories,
+        'top_tags': [{'name': name, 'count': count} for name, count in top],
+        'latest_created_at': max((row['latest_created_at'] for row in rows if row['latest_created_at']), default=None),
+        'refreshed_at': max(refreshed) if refreshed else None,
+    }
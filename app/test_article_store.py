@@ -0,0 +1,24 @@
+from models import Article, CrawlJob, Tag
+from article_store import upsert_article
+
+
+def test_upsert_refreshes_tags_when_content_is_unchanged(db):
+    parsed = {'title': '標題', 'content': '內文', 'tags': ['AI']}
+
+    assert upsert_article(db, '2cm', 'https://example.com/1', parsed) == 'created'
+    assert upsert_article(db, '2cm', 'https://example.com/1', parsed) == 'unchanged'
+    assert upsert_article(db, '2cm', 'https://example.com/1', {**parsed, 'tags': ['AI', '5G']}) == 'updated'
+    db.commit()
+
+    article = db.query(Article).one()
+    assert sorted(tag.name for tag in article.tags) == ['5G', 'AI']
+
+
+def test_upsert_skips_purged_urls(db):
+    db.add(CrawlJob(url='https://example.com/old', source='2cm', status='purged'))
+    db.flush()
+
+    parsed = {'title': '標題', 'content': '內文', 'tags': ['AI']}
+    assert upsert_article(db, '2cm', 'https://example.com/old', parsed) == 'purged'
+    assert db.query(Article).count() == 0
+    assert db.query(Tag).count() == 0
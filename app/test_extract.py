@@ -0,0 +1,19 @@
+import pytest
+from benchmark.server import StandInSite
+from scrapers import mem, netadmin, twocm
+
+SITE = StandInSite(paragraphs=5)
+
+PAGES = [(netadmin, 'netadmin'), (twocm, '2cm'), (mem, 'MEM')]
+
+
+@pytest.mark.parametrize('module, source', PAGES)
+def test_fast_extraction_matches_full_parse(module, source):
+    html = SITE.article_html(source, 1)
+
+    full = module.parse_article(html, mode='full')
+    fast = module.parse_article(html, mode='fast')
+
+    assert full is not None
+    assert fast == full
+    assert full['tags'] == SITE.article_tags(source, 1)
@@ -0,0 +1,66 @@
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+import postprocess
+from article_store import upsert_article
+from models import Article
+from postprocess import _process_chunk, category_from_url, clean_text, make_summary, process_article
+
+
+def test_clean_text_normalizes_fullwidth_and_whitespace():
+    assert clean_text("  Ｗｉｎｄｏｗｓ　１１ 發表  \n\n\t 第二段　內容，完。\r\n") == "Windows 11 發表\n第二段 內容，完。"
+
+
+def test_summary_ends_at_sentence_boundary():
+    content = "這是第一句。" * 20 + "沒有句點的長句" * 20
+    summary = make_summary(content)
+    assert len(summary) <= 200
+    assert summary.endswith("。")
+    assert make_summary("短文。") == "短文。"
+    assert make_summary("字" * 300) == "字" * 199 + "…"
+
+
+def test_category_from_url():
+    assert category_from_url('netadmin', 'https://www.netadmin.com.tw/netadmin/zh-tw/news/123') == 'news'
+    assert category_from_url('2cm', 'https://www.2cm.com.tw/2cm/zh-tw/tech/1') == 'tech'
+    assert category_from_url('MEM', 'https://www.mem.com.tw/post/') is None
+
+
+def test_process_article_keeps_parser_category_as_fallback():
+    parsed = {'title': ' 標題 ', 'content': '內文。', 'tags': ['AI'], 'category': 'news'}
+    result = process_article(parsed, 'MEM', 'https://www.mem.com.tw/post/')
+    assert result['title'] == '標題'
+    assert result['summary'] == '內文。'
+    assert result['category'] == 'news'
+    assert result['tags'] == ['AI']
+
+
+def test_recrawl_of_backfilled_article_is_unchanged(db):
+    raw = {'title': ' 標題 ', 'content': 'ＡＩ　新聞\n\n內文。', 'tags': []}
+    upsert_article(db, 'MEM', 'https://www.mem.com.tw/post/', raw)
+    article = db.query(Article).one()
+
+    # 模擬 deferred 模式的 backfill：改存整理後的內容
+    (result,) = _process_chunk([(article.id, 'MEM', article.url, article.title, article.content, None)])
+    article.title, article.content = result['title'], result['content']
+    article.processed_at = datetime.now()
+    db.flush()
+
+    assert upsert_article(db, 'MEM', article.url, raw) == 'unchanged'
+    assert article.processed_at is not None
+    assert upsert_article(db, 'MEM', article.url, {**raw, 'content': '新的內文。'}) == 'updated'
+    assert article.processed_at is None
+
+
+def test_reprocess_keeps_summary_of_stripped_article(db, monkeypatch):
+    upsert_article(db, 'MEM', 'https://www.mem.com.tw/post/', process_article(
+        {'title': '標題', 'content': '第一句。第二句。', 'tags': []}, 'MEM', 'https://www.mem.com.tw/post/'))
+    # 模擬 retention 的 strip 模式：只清除內文
+    db.execute(update(Article).values(content=None, content_hash=None, content_length=None))
+    db.commit()
+
+    monkeypatch.setattr(postprocess, 'SessionLocal', sessionmaker(bind=db.get_bind()))
+    assert postprocess.backfill(reprocess=True, workers=1) == 0
+
+    db.expire_all()
+    assert db.query(Article).one().summary == '第一句。第二句。'
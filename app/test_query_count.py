@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from models import Article, Tag
+from article_store import article_to_dict, list_articles
+
+
+@contextmanager
+def count_queries(engine):
+    """計算區塊內送出的 SQL 數量"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _add_articles(db, count):
+    tags = [Tag(name=f'tag-{i}') for i in range(5)]
+    for i in range(count):
+        db.add(Article(
+            title=f'文章 {i}', url=f'https://example.com/{i}', source='netadmin',
+            content='內文' * 100, tags=tags[i % 3:i % 3 + 3],
+        ))
+    db.commit()
+    db.expunge_all()
+
+
+def test_list_articles_loads_tags_without_n_plus_one(db):
+    _add_articles(db, 30)
+    with count_queries(db.get_bind()) as statements:
+        articles = [article_to_dict(article) for article in list_articles(db, limit=30)]
+
+    assert len(articles) == 30
+    assert all(len(article['tags']) == 3 for article in articles)
+    # 一次查文章、一次查標籤，與文章數量無關
+    assert len(statements) == 2, statements
+
+
+def test_list_articles_does_not_load_content(db):
+    _add_articles(db, 3)
+    articles = list_articles(db, limit=3)
+
+    # 內文為延遲載入欄位，列表不應該把它讀進記憶體
+    assert all('content' not in article.__dict__ for article in articles)
+    assert all(article.content_length == 200 for article in articles)
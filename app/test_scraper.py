@@ -1,5 +1,6 @@
 import asyncio
 import sys
+from log_config import setup_logging
 from scrapers.mem import scrape_mem
 from scrapers.netadmin import scrape_netadmin
 from scrapers.twocm import scrape_2cm
@@ -25,6 +26,7 @@ if __name__ == "__main__":
         sys.exit(1)
         
     source = sys.argv[1]
+    setup_logging()
     
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
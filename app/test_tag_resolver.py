@@ -0,0 +1,28 @@
+from models import Tag, TagAlias
+from article_store import TagResolver, tag_key
+
+
+def test_tag_key_ignores_case_width_and_spacing():
+    assert tag_key(' ＡＩ ') == tag_key('ai') == tag_key('AI') == 'ai'
+    assert tag_key('Wi-Fi　7') == tag_key('wi-fi  7') == 'wi-fi 7'
+
+
+def test_resolver_maps_variants_to_one_tag(db):
+    resolver = TagResolver()
+
+    tags = [resolver.resolve(db, name) for name in ['Kubernetes', 'kubernetes ', 'ＫＵＢＥＲＮＥＴＥＳ']]
+    db.commit()
+
+    assert len({tag.id for tag in tags}) == 1
+    assert db.query(Tag).count() == 1
+    assert db.get(TagAlias, 'kubernetes').tag_id == tags[0].id
+    assert resolver.resolve(db, '') is None
+
+
+def test_resolver_reuses_existing_tag_without_alias(db):
+    db.add(Tag(name='AI'))
+    db.commit()
+
+    tag = TagResolver().resolve(db, 'ai')
+    assert tag.name == 'AI'
+    assert db.query(Tag).count() == 1
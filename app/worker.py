@@ -0,0 +1,216 @@
+import warnings
+from bs4.builder import XMLParsedAsHTMLWarning
+
+# 忽略 BeautifulSoup 的 XML/HTML 警告
+warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+from datetime import timedelta
+import aiohttp
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from article_store import upsert_article
+from database import SessionLocal
+from fetch import HEADERS, connector
+from metrics import ARTICLES, DB_WRITE_SECONDS, serve_metrics, timer, trace_config
+from models import CrawlJob
+from sources import SOURCE_MODULES, load_source
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.getenv('WORKER_MAX_ATTEMPTS', '3'))
+LEASE_SECONDS = int(os.getenv('WORKER_LEASE_SECONDS', '300'))
+RETRY_DELAY_SECONDS = int(os.getenv('WORKER_RETRY_DELAY_SECONDS', '60'))
+# 設定時在這個埠提供 /metrics（抓取、解析與寫入的計時都發生在 worker 程序）
+METRICS_PORT = os.getenv('WORKER_METRICS_PORT')
+
+def enqueue(db, source, urls, refresh=False, refresh_after=None):
+    """把文章 URL 加入佇列，已存在的 URL 略過
+
+    refresh 時把已完成或失敗的重新排入；refresh_after（timedelta）只重新排入超過這段時間沒有更新的工作。
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return 0
+
+    stmt = insert(CrawlJob).values([
+        {'url': url, 'source': source, 'status': 'pending', 'attempts': 0}
+        for url in urls
+    ])
+    if refresh or refresh_after:
+        where = CrawlJob.status.in_(['done', 'failed'])
+        if refresh_after:
+            where &= CrawlJob.updated_at < func.now() - refresh_after
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['url'],
+            set_={'status': 'pending', 'attempts': 0, 'available_at': func.now(), 'updated_at': func.now()},
+            where=where
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['url'])
+
+    result = db.execute(stmt)
+    db.commit()
+    return result.rowcount
+
+
+def requeue_stale(db):
+    """回收租約過期的工作：還有重試次數的重新排入，否則標記失敗"""
+    expired = (CrawlJob.status == 'running') & (CrawlJob.lease_expires_at < func.now())
+    failed = db.execute(
+        update(CrawlJob)
+        .where(expired, CrawlJob.attempts >= MAX_ATTEMPTS)
+        .values(status='failed', worker_id=None, last_error='lease expired', updated_at=func.now())
+    ).rowcount
+    requeued = db.execute(
+        update(CrawlJob)
+        .where(expired)
+        .values(status='pending', worker_id=None, updated_at=func.now())
+    ).rowcount
+    db.commit()
+    if failed or requeued:
+        logger.warning("[Worker] 回收過期工作: 重新排入 %s，標記失敗 %s", requeued, failed)
+    return requeued
+
+
+def claim_jobs(db, worker_id, limit):
+    """以 FOR UPDATE SKIP LOCKED 領取一批工作，多個 worker 同時領取不會拿到同一筆"""
+    now = db.scalar(select(func.now()))
+    jobs = (
+        db.query(CrawlJob)
+        .filter(CrawlJob.status == 'pending', CrawlJob.available_at <= now)
+        .order_by(CrawlJob.available_at, CrawlJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job in jobs:
+        job.status = 'running'
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.lease_expires_at = now + timedelta(seconds=LEASE_SECONDS)
+    db.commit()
+    return jobs
+
+
+def finish_job(db, job, error=None):
+    """記錄工作結果，失敗且還有重試次數時延後重新排入"""
+    job.worker_id = None
+    job.lease_expires_at = None
+    job.last_error = error
+    if error is None:
+        job.status = 'done'
+    elif job.attempts < MAX_ATTEMPTS:
+        job.status = 'pending'
+        job.available_at = db.scalar(select(func.now())) + timedelta(seconds=RETRY_DELAY_SECONDS * job.attempts)
+    else:
+        job.status = 'failed'
+
+
+async def discover(source=None, refresh=False, refresh_after=None):
+    """從各來源的列表頁 / RSS 找出文章連結並加入佇列"""
+    sources = [source] if source else list(SOURCE_MODULES)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector(), timeout=timeout, headers=HEADERS,
+                                     trace_configs=[trace_config()]) as session:
+        for name in sources:
+            module = load_source(name)
+            try:
+                if name == 'netadmin':
+                    urls = []
+                    for category_url in module.CATEGORIES:
+                        urls.extend(link['url'] for link in await module.get_article_links(session, category_url))
+                elif name == '2cm':
+                    urls = await module.get_article_links(session, None)
+                else:
+                    urls = await module.get_article_links(session)
+            except Exception as e:
+                logger.error("[Worker] 取得 %s 文章列表時發生錯誤: %s", name, e, extra={'source': name})
+                continue
+
+            db = SessionLocal()
+            try:
+                added = enqueue(db, name, urls, refresh=refresh, refresh_after=refresh_after)
+                logger.info("[Worker] %s: 找到 %s 篇文章，新排入 %s 筆", name, len(urls), added, extra={'source': name})
+            finally:
+                db.close()
+
+
+async def _process(session, job):
+    """抓取並解析一筆工作"""
+    try:
+        return await load_source(job.source).get_article_content(session, job.url), None
+    except Exception as e:
+        return None, str(e)
+
+
+async def run_worker(batch_size=20, poll_interval=5.0):
+    """持續領取並處理工作，直到收到 SIGTERM / SIGINT"""
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    if sys.platform != 'win32':
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+    logger.info("[Worker] %s 啟動，每批 %s 筆", worker_id, batch_size, extra={'worker_id': worker_id})
+    metrics_runner = await serve_metrics(METRICS_PORT) if METRICS_PORT else None
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector(), timeout=timeout, headers=HEADERS,
+                                     trace_configs=[trace_config()]) as session:
+        while not stop.is_set():
+            # claim_jobs commit 後不讓工作過期：抓取期間讀取 job.url / job.source 不必再查詢資料庫，
+            # 也不會在等待網路時開著交易
+            db = SessionLocal(expire_on_commit=False)
+            try:
+                requeue_stale(db)
+                jobs = claim_jobs(db, worker_id, batch_size)
+                if not jobs:
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                # 同一批的文章同時抓取
+                results = await asyncio.gather(*(_process(session, job) for job in jobs))
+
+                for job, (parsed, error) in zip(jobs, results):
+                    if parsed:
+                        try:
+                            with timer(DB_WRITE_SECONDS, source=job.source), db.begin_nested():
+                                result = upsert_article(db, job.source, job.url, parsed)
+                            ARTICLES.inc(source=job.source, result=result)
+                        except Exception as e:
+                            error = f"儲存失敗: {str(e)}"
+                    elif error is None:
+                        error = '沒有取得文章內容'
+                    if error:
+                        ARTICLES.inc(source=job.source, result='failed')
+                    finish_job(db, job, error)
+                db.commit()
+                logger.info("[Worker] 完成 %s 筆工作", len(jobs), extra={'worker_id': worker_id, 'count': len(jobs)})
+            except Exception:
+                logger.exception("[Worker] 處理工作時發生錯誤", extra={'worker_id': worker_id})
+                db.rollback()
+                await asyncio.sleep(poll_interval)
+            finally:
+                db.close()
+
+    if metrics_runner:
+        await metrics_runner.cleanup()
+    logger.info("[Worker] %s 已停止", worker_id, extra={'worker_id': worker_id})
+
+
+if __name__ == "__main__":
+    from cli import main
+    # python worker.py run|discover 與 python cli.py worker|discover 相同
+    argv = sys.argv[1:]
+    if argv[:1] == ['run']:
+        argv[0] = 'worker'
+    sys.exit(main(argv))